@@ -3,9 +3,26 @@ from pydantic import BaseModel
 import databutton as db
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
-router = APIRouter()
+from app.libs.correlation import row_moments as _compute_row_moments, vector_pearson
+from app.libs.responses import DefaultJSONResponse
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional; pandas builds the pivot without it
+    pa = None
+
+router = APIRouter(default_response_class=DefaultJSONResponse)
+
+# O*NET dataset backing each assessment type
+ONET_DATASETS = {
+    "skills": "elements-skills-csv",
+    "abilities": "elements-abilities-csv",
+    "knowledge": "elements-knowledge-2-csv",
+}
 
 # Define the request model for each type of assessment
 class ScoreItem(BaseModel):
@@ -45,42 +62,36 @@ def analyze_assessment_results(request: AnalysisRequest) -> AnalysisResponse:
 def _analyze_skills(skills: List[ScoreItem]) -> AnalysisResponse:
     """Analyze user skills and find matching occupations"""
     try:
-        # Load the skills data
-        skills_df = db.storage.dataframes.get("elements-skills-csv")
-        
-        # Filter to importance scores only
-        skills_df = skills_df[skills_df["Scale Name"] == "Importance"]
-        
-        # Create pivot table with occupations as rows and skills as columns
-        occupation_skills = pd.pivot_table(
-            skills_df, 
-            values="Data Value", 
-            index="Title", 
-            columns="Element Name",
-            aggfunc="mean"
-        )
+        # Cached importance matrix with occupations as rows and skills as columns
+        occupation_skills, titles, skill_names = _occupation_matrix("skills")
         
         # Create user profile dictionary
         user_skill_dict = {item.name: item.rating for item in skills}
         
-        # Create a Series for the user's skill profile
-        user_profile = pd.Series(user_skill_dict)
-        
-        # Find matching skills
-        common_skills = set(user_profile.index) & set(occupation_skills.columns)
+        # Find matching skills by their cached column position
+        skill_columns = _element_columns("skills")
+        columns = sorted(skill_columns[name] for name in user_skill_dict if name in skill_columns)
         
-        if not common_skills:
+        if not columns:
             raise ValueError("No matching skills found")
         
-        # Filter data to common skills
-        user_profile = user_profile[list(common_skills)]
-        occupation_skills = occupation_skills[list(common_skills)]
+        # User ratings in matrix column order
+        user_values = np.fromiter(
+            (user_skill_dict[skill_names[i]] for i in columns), dtype=np.float64, count=len(columns)
+        )
+        
+        if len(columns) == len(skill_names):
+            # Every element was answered, so the cached row statistics apply
+            row_moments = _row_moments("skills")
+        else:
+            occupation_skills = occupation_skills.take(columns, axis=1)
+            row_moments = None
         
         # Calculate correlations
-        correlations = _calculate_correlations(user_profile, occupation_skills)
+        correlations = _calculate_correlations(user_values, occupation_skills, titles, row_moments)
         
         return AnalysisResponse(
-            matches=correlations[:20],  # Top 20 matches
+            matches=correlations,  # Top 20 matches
             category="skills"
         )
     except Exception as e:
@@ -89,42 +100,36 @@ def _analyze_skills(skills: List[ScoreItem]) -> AnalysisResponse:
 def _analyze_abilities(abilities: List[ScoreItem]) -> AnalysisResponse:
     """Analyze user abilities and find matching occupations"""
     try:
-        # Load the abilities data
-        abilities_df = db.storage.dataframes.get("elements-abilities-csv")
-        
-        # Filter to importance scores only
-        abilities_df = abilities_df[abilities_df["Scale Name"] == "Importance"]
-        
-        # Create pivot table with occupations as rows and abilities as columns
-        occupation_abilities = pd.pivot_table(
-            abilities_df, 
-            values="Data Value", 
-            index="Title", 
-            columns="Element Name",
-            aggfunc="mean"
-        )
+        # Cached importance matrix with occupations as rows and abilities as columns
+        occupation_abilities, titles, ability_names = _occupation_matrix("abilities")
         
         # Create user profile dictionary
         user_ability_dict = {item.name: item.rating for item in abilities}
         
-        # Create a Series for the user's ability profile
-        user_profile = pd.Series(user_ability_dict)
+        # Find matching abilities by their cached column position
+        ability_columns = _element_columns("abilities")
+        columns = sorted(ability_columns[name] for name in user_ability_dict if name in ability_columns)
         
-        # Find matching abilities
-        common_abilities = set(user_profile.index) & set(occupation_abilities.columns)
-        
-        if not common_abilities:
+        if not columns:
             raise ValueError("No matching abilities found")
         
-        # Filter data to common abilities
-        user_profile = user_profile[list(common_abilities)]
-        occupation_abilities = occupation_abilities[list(common_abilities)]
+        # User ratings in matrix column order
+        user_values = np.fromiter(
+            (user_ability_dict[ability_names[i]] for i in columns), dtype=np.float64, count=len(columns)
+        )
+        
+        if len(columns) == len(ability_names):
+            # Every element was answered, so the cached row statistics apply
+            row_moments = _row_moments("abilities")
+        else:
+            occupation_abilities = occupation_abilities.take(columns, axis=1)
+            row_moments = None
         
         # Calculate correlations
-        correlations = _calculate_correlations(user_profile, occupation_abilities)
+        correlations = _calculate_correlations(user_values, occupation_abilities, titles, row_moments)
         
         return AnalysisResponse(
-            matches=correlations[:20],  # Top 20 matches
+            matches=correlations,  # Top 20 matches
             category="abilities"
         )
     except Exception as e:
@@ -133,83 +138,165 @@ def _analyze_abilities(abilities: List[ScoreItem]) -> AnalysisResponse:
 def _analyze_knowledge(knowledge: List[ScoreItem]) -> AnalysisResponse:
     """Analyze user knowledge and find matching occupations"""
     try:
-        # Load the knowledge data
-        knowledge_df = db.storage.dataframes.get("elements-knowledge-2-csv")
-        
-        # Filter to importance scores only
-        knowledge_df = knowledge_df[knowledge_df["Scale Name"] == "Importance"]
-        
-        # Create pivot table with occupations as rows and knowledge areas as columns
-        occupation_knowledge = pd.pivot_table(
-            knowledge_df, 
-            values="Data Value", 
-            index="Title", 
-            columns="Element Name",
-            aggfunc="mean"
-        )
+        # Cached importance matrix with occupations as rows and knowledge areas as columns
+        occupation_knowledge, titles, knowledge_names = _occupation_matrix("knowledge")
         
         # Create user profile dictionary
         user_knowledge_dict = {item.name: item.rating for item in knowledge}
         
-        # Create a Series for the user's knowledge profile
-        user_profile = pd.Series(user_knowledge_dict)
-        
-        # Find matching knowledge areas
-        common_knowledge = set(user_profile.index) & set(occupation_knowledge.columns)
+        # Find matching knowledge areas by their cached column position
+        knowledge_columns = _element_columns("knowledge")
+        columns = sorted(knowledge_columns[name] for name in user_knowledge_dict if name in knowledge_columns)
         
-        if not common_knowledge:
+        if not columns:
             raise ValueError("No matching knowledge areas found")
         
-        # Filter data to common knowledge areas
-        user_profile = user_profile[list(common_knowledge)]
-        occupation_knowledge = occupation_knowledge[list(common_knowledge)]
+        # User ratings in matrix column order
+        user_values = np.fromiter(
+            (user_knowledge_dict[knowledge_names[i]] for i in columns), dtype=np.float64, count=len(columns)
+        )
+        
+        if len(columns) == len(knowledge_names):
+            # Every element was answered, so the cached row statistics apply
+            row_moments = _row_moments("knowledge")
+        else:
+            occupation_knowledge = occupation_knowledge.take(columns, axis=1)
+            row_moments = None
         
         # Calculate correlations
-        correlations = _calculate_correlations(user_profile, occupation_knowledge)
+        correlations = _calculate_correlations(user_values, occupation_knowledge, titles, row_moments)
         
         return AnalysisResponse(
-            matches=correlations[:20],  # Top 20 matches
+            matches=correlations,  # Top 20 matches
             category="knowledge"
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing knowledge: {str(e)}")
 
-def _calculate_correlations(user_profile: pd.Series, occupation_data: pd.DataFrame) -> List[CareerMatch]:
-    """Calculate Pearson correlation coefficient between user profile and occupations"""
-    # User profile statistics
-    user_mean = user_profile.mean()
-    user_std = user_profile.std()
+def _importance_pivot(df: pd.DataFrame) -> pd.DataFrame:
+    """Average Importance ratings into an occupation x element matrix"""
+    # Plain ndarray mask skips index alignment on the boolean filter
+    importance_df = df.loc[
+        df["Scale Name"].to_numpy() == "Importance",
+        ["Title", "Element Name", "Data Value"]
+    ]
+    
+    # Cython groupby mean is much cheaper than the generic pivot_table path
+    return (
+        importance_df
+        .groupby(["Title", "Element Name"])["Data Value"]
+        .mean()
+        .unstack("Element Name")
+    )
+
+def _importance_arrays_pandas(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """_importance_pivot as the dense arrays _occupation_matrix caches"""
+    pivot = _importance_pivot(df)
+    return (
+        pivot.to_numpy(dtype=np.float32),
+        pivot.index.to_numpy(),
+        pivot.columns.to_numpy(),
+    )
+
+def _importance_arrays_arrow(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Arrow equivalent of _importance_pivot, returned as dense arrays
+
+    Filtering and the grouped mean run in Arrow's compute kernels; the
+    result is scattered into a NaN-filled matrix with titles and element
+    names sorted exactly as the pandas pivot orders them.
+    """
+    table = pa.Table.from_pandas(
+        df[["Title", "Element Name", "Scale Name", "Data Value"]], preserve_index=False
+    )
+    # Arrow groups null keys where pandas' groupby drops them
+    table = table.filter(
+        pc.and_(
+            pc.and_(pc.is_valid(table["Title"]), pc.is_valid(table["Element Name"])),
+            pc.equal(table["Scale Name"], "Importance"),
+        )
+    )
+    grouped = table.group_by(["Title", "Element Name"]).aggregate([("Data Value", "mean")])
+    
+    titles = pc.unique(grouped["Title"]).sort()
+    element_names = pc.unique(grouped["Element Name"]).sort()
+    rows = pc.index_in(grouped["Title"], value_set=titles).to_numpy()
+    columns = pc.index_in(grouped["Element Name"], value_set=element_names).to_numpy()
+    
+    matrix = np.full((len(titles), len(element_names)), np.nan, dtype=np.float32)
+    matrix[rows, columns] = grouped["Data Value_mean"].to_numpy()
+    
+    return (
+        matrix,
+        titles.to_numpy(zero_copy_only=False),
+        element_names.to_numpy(zero_copy_only=False),
+    )
+
+@lru_cache(maxsize=None)
+def _occupation_matrix(kind: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Load and pivot the O*NET importance data for a category once per process
+
+    Returns the (occupations x elements) matrix with its row titles and
+    column element names. The arrays are shared between requests and are
+    therefore read-only.
+    """
+    df = db.storage.dataframes.get(ONET_DATASETS[kind])
+    
+    # Ratings carry one decimal, so float32 loses nothing and halves the
+    # bytes every correlation scan reads
+    if pa is not None:
+        matrix, titles, element_names = _importance_arrays_arrow(df)
+    else:
+        matrix, titles, element_names = _importance_arrays_pandas(df)
+    for array in (matrix, titles, element_names):
+        array.flags.writeable = False
     
+    return matrix, titles, element_names
+
+@lru_cache(maxsize=None)
+def _element_columns(kind: str) -> Dict[str, int]:
+    """Map each element name of a category to its cached matrix column"""
+    _, _, element_names = _occupation_matrix(kind)
+    return {name: i for i, name in enumerate(element_names)}
+
+@lru_cache(maxsize=None)
+def _row_moments(kind: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-occupation sum and sum of squares across every element of a category"""
+    matrix, _, _ = _occupation_matrix(kind)
+    return _compute_row_moments(matrix)
+
+def _calculate_correlations(
+    user_values: np.ndarray,
+    occupation_matrix: np.ndarray,
+    titles: np.ndarray,
+    row_moments: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    limit: int = 20
+) -> List[CareerMatch]:
+    """Calculate Pearson correlation coefficient between user profile and occupations
+
+    `occupation_matrix` holds one row per entry of `titles`, with columns in
+    the same order as `user_values`. `row_moments` are the cached row sums
+    and sums of squares of that exact matrix; they are only valid when no
+    columns were dropped, otherwise they are derived from the slice.
+    """
     # Number of items being compared
-    n_items = len(user_profile)
+    n_items = len(user_values)
     
-    # Results list
-    results = []
+    # This endpoint has always reported the sum of products over
+    # n * std * std (ddof=1), i.e. Pearson r scaled by (n - 1) / n
+    correlations = vector_pearson(user_values, occupation_matrix, row_moments)
+    correlations *= (n_items - 1) / n_items
     
-    # Calculate correlation for each occupation
-    for occupation, row in occupation_data.iterrows():
-        # Skip if either has zero standard deviation
-        if user_std == 0 or row.std() == 0:
-            continue
-            
-        # Occupation profile statistics
-        occ_mean = row.mean()
-        occ_std = row.std()
-        
-        # Calculate the numerator: sum of products of deviations
-        sum_product = sum((user_profile - user_mean) * (row - occ_mean))
-        
-        # Calculate Pearson correlation
-        correlation = sum_product / (n_items * user_std * occ_std)
-        
-        # Only include positive correlations
-        if correlation > 0:
-            results.append(CareerMatch(
-                title=occupation,
-                correlation=float(correlation)
-            ))
+    # Only include positive correlations; flat profiles come back as NaN
+    candidates = np.flatnonzero(correlations > 0)
     
-    # Sort by correlation in descending order
-    results.sort(key=lambda x: x.correlation, reverse=True)
+    # Select the top matches without sorting every occupation
+    if len(candidates) > limit:
+        top = np.argpartition(-correlations[candidates], limit - 1)[:limit]
+        candidates = np.sort(candidates[top])
+    candidates = candidates[np.argsort(-correlations[candidates], kind="stable")]
     
-    return results
\ No newline at end of file
+    # Fields are already str/float, so skip pydantic validation
+    return [
+        CareerMatch.model_construct(title=str(titles[i]), correlation=float(correlations[i]))
+        for i in candidates
+    ]
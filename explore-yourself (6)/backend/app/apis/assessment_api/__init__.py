@@ -4,7 +4,9 @@ from pydantic import BaseModel
 from typing import List, Dict
 import databutton as db
 
-router = APIRouter()
+from app.libs.responses import DefaultJSONResponse
+
+router = APIRouter(default_response_class=DefaultJSONResponse)
 
 def categorize_ability(name: str) -> str:
     # Map ability areas to categories
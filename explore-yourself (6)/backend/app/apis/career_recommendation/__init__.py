@@ -2,14 +2,31 @@
 # Enhanced version with multi-category matching
 
 from contextlib import contextmanager
+from functools import lru_cache, wraps
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple, Any
-from scipy.stats import pearsonr
+from scipy.linalg import solve_triangular
+from scipy.optimize import minimize
+from scipy.special import expit
+from scipy.stats import rankdata
+from typing import Callable, List, Dict, Mapping, Optional, Pattern, Tuple, Any, Union
 import logging
 import json
+import re
+import threading
+import warnings
+
+from app.libs.correlation import (
+    NARROW_MAX_ITEMS,
+    batch_vector_pearson,
+    masked_vector_pearson,
+    narrow_vector_pearson,
+    row_moments,
+    vector_pearson,
+)
+from app.libs.weighted_fit import weighted_cosine_rows, weighted_fit, weighted_fit_rows
 
 try:
     import databutton as db  # type: ignore
@@ -77,35 +94,63 @@ BASE_CRITICAL_REQUIREMENTS = [
 
 MAHALANOBIS_REGULARIZATION = 1e-3
 RIASEC_ORDER = ['Realistic', 'Investigative', 'Artistic', 'Social', 'Enterprising', 'Conventional']
+RIASEC_INDEX = {code: i for i, code in enumerate(RIASEC_ORDER)}
+# Steps between codes around the Holland hexagon; the extra last row and
+# column stand for names outside RIASEC, which are always 3 steps away
+HEXAGON_DISTANCES = np.array(
+    [[min(abs(i - j), 6 - abs(i - j)) if max(i, j) < 6 else 3 for j in range(7)] for i in range(7)],
+    dtype=np.int8
+)
+HEXAGON_DISTANCES.flags.writeable = False
 IACHAN_WEIGHTS = [3, 2, 1]
 IACHAN_WEIGHTED_TOTAL = sum(IACHAN_WEIGHTS)
 HEXAGON_CONGRUENCE_BLEND = 0.6  # weight for Iachan vs continuous distance
 
-# Cache for Mahalanobis inverse covariance matrices per dataset and element subset
+# Cache for Mahalanobis covariance Cholesky factors per dataset and element subset
 COVARIANCE_CACHE: Dict[str, Dict[Tuple[str, ...], Optional[np.ndarray]]] = {}
 
 
+# The weights, thresholds, critical rules and score calibration above are
+# replaced by the calibration endpoints, and grid searches install each
+# candidate temporarily. Sync endpoints share the threadpool, so everything
+# that reads or writes that state holds this lock; a request then never
+# scores against another request's candidate, and overlapping overrides
+# cannot restore each other's values. Re-entrant because overrides nest
+# inside locked endpoints.
+_SCORING_STATE_LOCK = threading.RLock()
+
+
+def _holds_scoring_state_lock(func):
+    """Run `func` while holding _SCORING_STATE_LOCK"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _SCORING_STATE_LOCK:
+            return func(*args, **kwargs)
+    return wrapper
+
+
 @contextmanager
 def temporary_weight_overrides(
     dimension_weights: Optional[Dict[str, float]] = None,
     combination_weights: Optional[Dict[str, float]] = None
 ):
-    original_dim = DIMENSION_WEIGHTS.copy()
-    original_comb = COMBINATION_WEIGHTS.copy()
+    with _SCORING_STATE_LOCK:
+        original_dim = DIMENSION_WEIGHTS.copy()
+        original_comb = COMBINATION_WEIGHTS.copy()
 
-    try:
-        if dimension_weights:
+        try:
+            if dimension_weights:
+                DIMENSION_WEIGHTS.clear()
+                DIMENSION_WEIGHTS.update(dimension_weights)
+            if combination_weights:
+                COMBINATION_WEIGHTS.clear()
+                COMBINATION_WEIGHTS.update(combination_weights)
+            yield
+        finally:
             DIMENSION_WEIGHTS.clear()
-            DIMENSION_WEIGHTS.update(dimension_weights)
-        if combination_weights:
+            DIMENSION_WEIGHTS.update(original_dim)
             COMBINATION_WEIGHTS.clear()
-            COMBINATION_WEIGHTS.update(combination_weights)
-        yield
-    finally:
-        DIMENSION_WEIGHTS.clear()
-        DIMENSION_WEIGHTS.update(original_dim)
-        COMBINATION_WEIGHTS.clear()
-        COMBINATION_WEIGHTS.update(original_comb)
+            COMBINATION_WEIGHTS.update(original_comb)
 
 
 @contextmanager
@@ -115,27 +160,73 @@ def temporary_threshold_overrides(
 ):
     global IMPORTANCE_CRITICAL_THRESHOLD, MIN_REQUIREMENT_RATIO, CRITICAL_REQUIREMENTS
 
-    original_importance = IMPORTANCE_CRITICAL_THRESHOLD
-    original_ratio = MIN_REQUIREMENT_RATIO
-    original_rules = CRITICAL_REQUIREMENTS
+    with _SCORING_STATE_LOCK:
+        original_importance = IMPORTANCE_CRITICAL_THRESHOLD
+        original_ratio = MIN_REQUIREMENT_RATIO
+        original_rules = CRITICAL_REQUIREMENTS
 
-    try:
-        if importance_threshold is not None:
-            IMPORTANCE_CRITICAL_THRESHOLD = float(importance_threshold)
-        if min_requirement_ratio is not None:
-            MIN_REQUIREMENT_RATIO = float(min_requirement_ratio)
+        try:
+            if importance_threshold is not None:
+                IMPORTANCE_CRITICAL_THRESHOLD = float(importance_threshold)
+            if min_requirement_ratio is not None:
+                MIN_REQUIREMENT_RATIO = float(min_requirement_ratio)
+
+            if importance_threshold is not None or min_requirement_ratio is not None:
+                CRITICAL_REQUIREMENTS = _calibrate_critical_requirements(
+                    BASE_CRITICAL_REQUIREMENTS,
+                    importance_threshold=IMPORTANCE_CRITICAL_THRESHOLD,
+                    level_ratio=MIN_REQUIREMENT_RATIO
+                )
+            yield
+        finally:
+            IMPORTANCE_CRITICAL_THRESHOLD = original_importance
+            MIN_REQUIREMENT_RATIO = original_ratio
+            CRITICAL_REQUIREMENTS = original_rules
+
+
+@lru_cache(maxsize=8)
+def _get_elements_df(dataframe_name: str) -> Optional[pd.DataFrame]:
+    """Raw O*NET table, fetched from storage once per process.
+
+    The O*NET tables are static between deployments, so calibration, the
+    pivots and the bootstrap generator all share this copy; callers must
+    not modify it.
+    """
+    return db.storage.dataframes.get(dataframe_name)
 
-        if importance_threshold is not None or min_requirement_ratio is not None:
-            CRITICAL_REQUIREMENTS = _calibrate_critical_requirements(
-                BASE_CRITICAL_REQUIREMENTS,
-                importance_threshold=IMPORTANCE_CRITICAL_THRESHOLD,
-                level_ratio=MIN_REQUIREMENT_RATIO
-            )
-        yield
-    finally:
-        IMPORTANCE_CRITICAL_THRESHOLD = original_importance
-        MIN_REQUIREMENT_RATIO = original_ratio
-        CRITICAL_REQUIREMENTS = original_rules
+
+@lru_cache(maxsize=None)
+def _scale_frames(dataframe_name: str) -> Dict[str, pd.DataFrame]:
+    """Split an O*NET table by scale once per process.
+
+    Calibration, the pivots and the bootstrap generator all read these
+    frames. Only the columns they use are kept, and the split runs on the
+    categorical codes of "Scale Name" rather than string comparisons.
+    """
+    df = _get_elements_df(dataframe_name)
+
+    scales = df["Scale Name"].astype("category")
+    codes = scales.cat.codes.to_numpy()
+    values = df[["Title", "Element Name", "Data Value"]]
+
+    return {
+        scale: values[codes == code]
+        for code, scale in enumerate(scales.cat.categories)
+    }
+
+
+def _scale_rows(dataframe_name: str, scale: Optional[str]) -> pd.DataFrame:
+    """Rows of an O*NET table for a single scale, or all rows when the
+    table has no scales (interests)"""
+    if scale is None:
+        df = _get_elements_df(dataframe_name)
+        return df[["Title", "Element Name", "Data Value"]]
+
+    frames = _scale_frames(dataframe_name)
+    if scale in frames:
+        return frames[scale]
+    # No rows on this scale (or none at all), as a mask over the table gives
+    return _get_elements_df(dataframe_name)[["Title", "Element Name", "Data Value"]].iloc[:0]
 
 
 def _calibrate_thresholds(
@@ -162,15 +253,15 @@ def _calibrate_thresholds(
 
     try:
         for dataset in datasets:
-            df = db.storage.dataframes.get(dataset)
+            df = _get_elements_df(dataset)
             if df is None:
                 continue
 
             importance_values.extend(
-                df[df["Scale Name"] == "Importance"]["Data Value"].dropna().tolist()
+                _scale_rows(dataset, "Importance")["Data Value"].dropna().tolist()
             )
             level_values.extend(
-                df[df["Scale Name"] == "Level"]["Data Value"].dropna().tolist()
+                _scale_rows(dataset, "Level")["Data Value"].dropna().tolist()
             )
 
         if importance_values:
@@ -210,21 +301,27 @@ def _calibrate_critical_requirements(
         return base_rules
 
     try:
-        abilities_df = db.storage.dataframes.get("elements-abilities-csv")
-        if abilities_df is None:
+        if _get_elements_df("elements-abilities-csv") is None:
             return base_rules
 
-        level_df = abilities_df[abilities_df["Scale Name"] == "Level"]
-        importance_df = abilities_df[abilities_df["Scale Name"] == "Importance"]
+        # Split each scale by element once instead of rescanning it per rule
+        level_groups = dict(tuple(
+            _scale_rows("elements-abilities-csv", "Level").groupby("Element Name", sort=False)
+        ))
+        importance_groups = dict(tuple(
+            _scale_rows("elements-abilities-csv", "Importance").groupby("Element Name", sort=False)
+        ))
         imp_threshold = importance_threshold if importance_threshold is not None else IMPORTANCE_CRITICAL_THRESHOLD
         lvl_threshold = level_ratio if level_ratio is not None else MIN_REQUIREMENT_RATIO
         calibrated_rules: List[Dict[str, Any]] = []
 
         for rule in base_rules:
-            element_mask = level_df["Element Name"] == rule["element"]
-            level_subset = level_df[element_mask]
+            level_subset = level_groups.get(rule["element"])
+            importance_subset = importance_groups.get(rule["element"])
+            if level_subset is None or importance_subset is None:
+                calibrated_rules.append(dict(rule))
+                continue
 
-            importance_subset = importance_df[importance_df["Element Name"] == rule["element"]]
             merged = level_subset.merge(
                 importance_subset,
                 on="Title",
@@ -386,35 +483,40 @@ def build_category_matches(user_scores: UserScores) -> Dict[str, Dict[str, Dict[
     return category_matches
 
 
+@lru_cache(maxsize=None)
+def _get_pivot(dataframe_name: str, scale: Optional[str]) -> pd.DataFrame:
+    """Occupation x element pivot of one scale, built once per process.
+
+    The frame is shared between requests; callers must not modify it.
+    """
+    # Cython groupby mean is much cheaper than the generic pivot_table path;
+    # dropping all-NaN rows and columns keeps pivot_table's output
+    return (
+        _scale_rows(dataframe_name, scale)
+        .groupby(["Title", "Element Name"])["Data Value"]
+        .mean()
+        .unstack("Element Name")
+        .dropna(how="all")
+        .dropna(axis=1, how="all")
+    )
+
+
+@lru_cache(maxsize=8)
 def load_element_matrices(
     dataframe_name: str,
     level_scale: str = "Level",
     importance_scale: str = "Importance"
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """Load Level and Importance pivots for an O*NET data table."""
+    """Load Level and Importance pivots for an O*NET data table.
+
+    Built once per process; the frames are shared, callers must not
+    modify them.
+    """
     if db is None:
         raise RuntimeError("Databutton storage is not available in this environment")
 
-    df = db.storage.dataframes.get(dataframe_name)
-
-    level_df = df[df["Scale Name"] == level_scale]
-    importance_df = df[df["Scale Name"] == importance_scale]
-
-    level_pivot = pd.pivot_table(
-        level_df,
-        values="Data Value",
-        index="Title",
-        columns="Element Name",
-        aggfunc="mean"
-    )
-
-    importance_pivot = pd.pivot_table(
-        importance_df,
-        values="Data Value",
-        index="Title",
-        columns="Element Name",
-        aggfunc="mean"
-    )
+    level_pivot = _get_pivot(dataframe_name, level_scale)
+    importance_pivot = _get_pivot(dataframe_name, importance_scale)
 
     # Align indices and columns across matrices
     common_titles = level_pivot.index.intersection(importance_pivot.index)
@@ -431,6 +533,66 @@ def load_element_matrices(
     return level_pivot, importance_pivot
 
 
+@lru_cache(maxsize=8)
+def _element_arrays(
+    dataframe_name: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, int]]:
+    """load_element_matrices as read-only arrays: levels, importances,
+    occupation titles and the column of each element.
+
+    Levels and importances are float32; every score built from them is
+    clipped to [0, 1], and the kernels accumulate in float64.
+    """
+    level_matrix, importance_matrix = load_element_matrices(dataframe_name)
+
+    # Row-major, so each occupation's elements are contiguous for the row
+    # kernels and the column subsets taken per request
+    levels = np.ascontiguousarray(level_matrix.to_numpy(dtype=np.float32))
+    importances = np.ascontiguousarray(importance_matrix.to_numpy(dtype=np.float32))
+    titles = level_matrix.index.to_numpy()
+    for array in (levels, importances, titles):
+        array.flags.writeable = False
+
+    element_columns = {element: j for j, element in enumerate(level_matrix.columns)}
+    return levels, importances, titles, element_columns
+
+
+@lru_cache(maxsize=8)
+def _level_covariance(dataframe_name: str) -> Optional[np.ndarray]:
+    """Covariance of every element level across occupations, read-only.
+
+    Only built when no occupation is missing a level: the covariance of
+    any element subset is then its principal submatrix. Otherwise None,
+    and each subset is estimated on its own complete rows.
+    """
+    levels = _element_arrays(dataframe_name)[0]
+    if levels.shape[0] < 2 or levels.shape[1] == 0 or np.isnan(levels).any():
+        return None
+    # np.cov promotes to float64, so the inverses stay in double precision
+    cov = np.atleast_2d(np.cov(levels, rowvar=False))
+    cov.flags.writeable = False
+    return cov
+
+
+def _clear_onet_caches() -> None:
+    """Forget every table, pivot and matrix derived from O*NET storage"""
+    for cached in (
+        _get_elements_df,
+        _scale_frames,
+        _get_pivot,
+        load_element_matrices,
+        _element_arrays,
+        _level_covariance,
+        _normalized_occupations,
+        _normalized_row_moments,
+        _interest_profiles,
+        _interest_columns,
+        _interest_congruence_profiles,
+    ):
+        cached.cache_clear()
+    COVARIANCE_CACHE.clear()
+
+
 def rescale_level_matrix(matrix: pd.DataFrame) -> pd.DataFrame:
     """Rescale level values to 0-100 if the original scale is small."""
     if matrix.empty:
@@ -454,6 +616,70 @@ def occupation_matches_keywords(occupation: str, keywords: List[str]) -> bool:
     return any(keyword.lower() in lowered for keyword in keywords)
 
 
+def _keyword_pattern(keywords: List[str]) -> Optional[Pattern[str]]:
+    """Case-insensitive pattern matching any keyword as a substring"""
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+_CriticalRuleEntry = Tuple[Dict[str, Any], frozenset, Optional[Pattern[str]]]
+
+# Critical rules paired with a set of their target occupations and their
+# compiled keyword pattern, together with the rule list they were derived
+# from; calibration swaps the list
+_CRITICAL_RULE_INDEX: Tuple[Optional[List[Dict[str, Any]]], List[_CriticalRuleEntry]] = (None, [])
+
+
+def _critical_rule_index(rules: List[Dict[str, Any]]) -> List[_CriticalRuleEntry]:
+    """Each rule with its target occupations as a set and its keywords as one
+    regex, rebuilt only when the rules change"""
+    global _CRITICAL_RULE_INDEX
+    source, index = _CRITICAL_RULE_INDEX
+    if source is not rules:
+        index = [
+            (
+                rule,
+                frozenset(rule.get("occupations") or ()),
+                _keyword_pattern(rule.get("keywords") or []),
+            )
+            for rule in rules
+        ]
+        _CRITICAL_RULE_INDEX = (rules, index)
+    return index
+
+
+# Per-rule boolean masks over an occupation title array, together with the
+# rule list and the titles they were built for
+_CRITICAL_RULE_TARGETS: Tuple[
+    Optional[List[Dict[str, Any]]], Optional[np.ndarray], List[np.ndarray]
+] = (None, None, [])
+
+
+def _critical_rule_targets(
+    rules: List[Dict[str, Any]],
+    titles: np.ndarray
+) -> List[np.ndarray]:
+    """For each rule, which of `titles` it targets by occupation or keyword,
+    rebuilt only when the rules or the titles change"""
+    global _CRITICAL_RULE_TARGETS
+    source, source_titles, targets = _CRITICAL_RULE_TARGETS
+    if source is not rules or source_titles is not titles:
+        lowered = np.array([title.lower() for title in titles.tolist()], dtype=object)
+        targets = []
+        for _, occupations, keyword_pattern in _critical_rule_index(rules):
+            target = np.isin(lowered, list(occupations))
+            if keyword_pattern is not None:
+                target |= np.array(
+                    [keyword_pattern.search(title) is not None for title in titles.tolist()],
+                    dtype=bool
+                )
+            target.flags.writeable = False
+            targets.append(target)
+        _CRITICAL_RULE_TARGETS = (rules, titles, targets)
+    return targets
+
+
 def apply_threshold_requirements(
     occupation: str,
     element_type: str,
@@ -472,20 +698,18 @@ def apply_threshold_requirements(
                 return False
 
     if element_type == 'abilities':
-        occupation_lower = occupation.lower()
-        for rule in CRITICAL_REQUIREMENTS:
+        # Lowercased at most once, and only if some rule's element applies
+        occupation_lower = None
+        for rule, occupations, keyword_pattern in _critical_rule_index(CRITICAL_REQUIREMENTS):
             element = rule.get("element")
             if element not in required_levels.index:
                 continue
 
-            occupations = rule.get("occupations") or []
-            keywords = rule.get("keywords") or []
-
-            is_target_occupation = False
-            if occupations:
-                is_target_occupation = occupation_lower in occupations
-            if not is_target_occupation and keywords:
-                is_target_occupation = occupation_matches_keywords(occupation, keywords)
+            if occupation_lower is None:
+                occupation_lower = occupation.lower()
+            is_target_occupation = occupation_lower in occupations
+            if not is_target_occupation and keyword_pattern is not None:
+                is_target_occupation = keyword_pattern.search(occupation) is not None
 
             if not is_target_occupation:
                 continue
@@ -505,48 +729,30 @@ def calculate_weighted_fit(
     importance_weights: pd.Series
 ) -> Tuple[float, float]:
     """Compute importance-weighted fit with diminishing returns."""
-    weighted_score = 0.0
-    total_weight = 0.0
-
-    for element in required_levels.index:
-        importance = float(importance_weights.get(element, 0.0))
-        if importance <= 0:
-            continue
-
-        required_level = float(required_levels[element])
-        user_level = float(user_values.get(element, 0.0))
-
-        if required_level <= 0:
-            fit = 1.0
-        elif user_level < required_level:
-            ratio = user_level / required_level if required_level > 0 else 0.0
-            fit = ratio ** 2
-        else:
-            overage = (user_level - required_level) / 100.0
-            fit = 1.0 - (1.0 - required_level / 100.0) * overage * OVERQUALIFICATION_DAMPING
-
-        fit = max(0.0, min(fit, 1.0))
-
-        weighted_score += fit * importance
-        total_weight += importance
-
-    if total_weight == 0:
-        return 0.0, 0.0
-
-    return weighted_score / total_weight, total_weight
+    elements = required_levels.index
+    return weighted_fit(
+        user_values.reindex(elements, fill_value=0.0).to_numpy(dtype=float),
+        required_levels.to_numpy(dtype=float),
+        importance_weights.reindex(elements, fill_value=0.0).to_numpy(dtype=float),
+        OVERQUALIFICATION_DAMPING
+    )
 
 
 def importance_weighted_cosine(
-    user_values: pd.Series,
-    required_levels: pd.Series,
-    importance_weights: pd.Series
+    user_values: np.ndarray,
+    required_levels: np.ndarray,
+    importance_weights: np.ndarray
 ) -> float:
-    """Calculate cosine similarity with importance weighting."""
-    importance = importance_weights / 100.0
-    weighted_user = (user_values * importance).to_numpy()
-    weighted_required = (required_levels * importance).to_numpy()
+    """Calculate cosine similarity with importance weighting.
 
-    numerator = float(np.dot(weighted_user, weighted_required))
+    The three arrays are aligned element by element; Series are read
+    positionally, without label alignment.
+    """
+    importance = np.asarray(importance_weights, dtype=float) / 100.0
+    weighted_user = np.asarray(user_values, dtype=float) * importance
+    weighted_required = np.asarray(required_levels, dtype=float) * importance
+
+    numerator = float(weighted_user @ weighted_required)
     denominator = float(np.linalg.norm(weighted_user) * np.linalg.norm(weighted_required))
 
     if denominator == 0:
@@ -557,27 +763,134 @@ def importance_weighted_cosine(
     return (cosine + 1.0) / 2.0
 
 
+def _threshold_pass_mask(
+    titles: np.ndarray,
+    element_type: str,
+    common_elements: List[str],
+    user_values: np.ndarray,
+    required_levels: np.ndarray,
+    importance_weights: np.ndarray,
+    present: np.ndarray
+) -> np.ndarray:
+    """apply_threshold_requirements for every occupation at once.
+
+    Arrays are occupations x common_elements; `present` marks the elements
+    each occupation has a level for.
+    """
+    critical = present & (importance_weights >= IMPORTANCE_CRITICAL_THRESHOLD)
+    failed = critical & (user_values < required_levels * MIN_REQUIREMENT_RATIO)
+    passed = ~failed.any(axis=1)
+
+    if element_type == 'abilities':
+        columns = {element: j for j, element in enumerate(common_elements)}
+        rules = CRITICAL_REQUIREMENTS
+        for (rule, _, _), target in zip(
+            _critical_rule_index(rules), _critical_rule_targets(rules, titles)
+        ):
+            j = columns.get(rule.get("element"))
+            if j is None:
+                continue
+
+            minimum = required_levels[:, j] * rule.get("threshold_ratio", MIN_REQUIREMENT_RATIO)
+            passed &= ~(target & present[:, j] & (user_values[j] < minimum))
+
+    return passed
+
+
+def _covariance_factor(
+    levels: np.ndarray,
+    columns: List[int],
+    key: Tuple[str, ...],
+    dataset_cache: Dict[Tuple[str, ...], Optional[np.ndarray]],
+    full_covariance: Optional[np.ndarray] = None
+) -> Optional[np.ndarray]:
+    """Lower Cholesky factor of the regularised covariance of occupation
+    levels over `columns`, cached under the element names in `key`.
+
+    `full_covariance` is the _level_covariance of `levels`, when there is
+    one; the subset is then sliced from it instead of re-estimated.
+    """
+    if key in dataset_cache:
+        return dataset_cache[key]
+
+    try:
+        if full_covariance is not None:
+            n_rows = levels.shape[0]
+            cov = full_covariance[np.ix_(columns, columns)]
+        else:
+            subset_matrix = levels[:, columns]
+            subset_matrix = subset_matrix[~np.isnan(subset_matrix).any(axis=1)]
+            n_rows = subset_matrix.shape[0]
+            cov = np.cov(subset_matrix, rowvar=False) if n_rows else None
+        if n_rows >= len(columns) and len(columns) > 0:
+            if cov.ndim == 0:
+                cov = np.array([[float(cov)]])
+            cov = cov + (MAHALANOBIS_REGULARIZATION * np.eye(cov.shape[0]))
+            # The ridge keeps cov positive definite, so this only fails on
+            # non-finite levels
+            factor = np.linalg.cholesky(cov)
+            factor.flags.writeable = False
+        else:
+            factor = None
+    except Exception as exc:  # pragma: no cover - numeric robustness
+        logger.debug("Mahalanobis cache build failed for %s (%s)", key, exc)
+        factor = None
+    dataset_cache[key] = factor
+    return factor
+
+
+def _combine_component_scores(
+    fit_scores: np.ndarray,
+    cosine_scores: np.ndarray,
+    mahalanobis_scores: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Blend of the fit, cosine and Mahalanobis scores under the current
+    COMBINATION_WEIGHTS, with the total weight behind each score.
+
+    Mahalanobis is NaN where it could not be computed and is then left out
+    of that occupation's blend.
+    """
+    weights = COMBINATION_WEIGHTS
+    fit_weight = max(float(weights.get('fit', 0.0)), 0.0)
+    cosine_weight = max(float(weights.get('cosine', 0.0)), 0.0)
+    mahal_weight = max(float(weights.get('mahalanobis', 0.0)), 0.0)
+
+    has_mahalanobis = ~np.isnan(mahalanobis_scores)
+    total_weights = fit_weight + cosine_weight + np.where(has_mahalanobis, mahal_weight, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        combined_scores = np.where(
+            total_weights <= 0,
+            fit_scores,
+            (
+                (fit_weight * fit_scores)
+                + (cosine_weight * cosine_scores)
+                + np.where(has_mahalanobis, mahal_weight * mahalanobis_scores, 0.0)
+            ) / total_weights
+        )
+    return combined_scores, total_weights
+
+
 def calculate_importance_weighted_matches(
     user_elements: List[Any],
     dataframe_name: str,
     element_type: str
 ) -> Dict[str, Dict[str, Any]]:
-    """Calculate matches using importance-weighted fit and cosine similarity."""
+    """Calculate matches using importance-weighted fit and cosine similarity.
+
+    Every occupation is scored at once on occupations x elements arrays;
+    only the survivors are turned into match dicts.
+    """
     matches: Dict[str, Dict[str, Any]] = {}
 
     if not user_elements:
         return matches
 
-    level_matrix, importance_matrix = load_element_matrices(dataframe_name)
+    levels, importances, titles, element_columns = _element_arrays(dataframe_name)
 
     user_dict = {item.name: float(item.rating) for item in user_elements}
-    user_profile = pd.Series(user_dict)
 
-    common_elements = sorted(
-        set(user_profile.index)
-        & set(level_matrix.columns)
-        & set(importance_matrix.columns)
-    )
+    # Sorted because the match dicts report their elements in this order
+    common_elements = sorted(element for element in user_dict if element in element_columns)
 
     if not common_elements:
         return matches
@@ -585,98 +898,90 @@ def calculate_importance_weighted_matches(
     min_overlap = MIN_OVERLAP_THRESHOLD.get(element_type, 3)
 
     dataset_cache = COVARIANCE_CACHE.setdefault(dataframe_name, {})
+    full_covariance = _level_covariance(dataframe_name)
+
+    columns = [element_columns[element] for element in common_elements]
+    required = levels[:, columns]
+    importance = importances[:, columns]
+    user = np.nan_to_num(np.array([user_dict[element] for element in common_elements]), nan=0.0)
+
+    # Elements an occupation has no level for are left out of its score
+    present = ~(np.isnan(required) | np.isnan(importance))
+    overlap = present.sum(axis=1)
+
+    candidates = overlap >= min_overlap
+    # Occupations with no importance on their present elements never score
+    candidates &= (present & (importance > 0)).any(axis=1)
+    candidates &= _threshold_pass_mask(
+        titles, element_type, common_elements, user, required, importance, present
+    )
 
-    for occupation in level_matrix.index:
-        required_levels = level_matrix.loc[occupation, common_elements]
-        importance_weights = importance_matrix.loc[occupation, common_elements]
-
-        mask = ~(required_levels.isna() | importance_weights.isna())
-        filtered_elements = [elem for elem, keep in zip(common_elements, mask) if keep]
-
-        if len(filtered_elements) < min_overlap:
-            continue
-
-        required_series = required_levels[mask].astype(float)
-        importance_series = importance_weights[mask].astype(float)
-        user_series = user_profile[filtered_elements].astype(float).fillna(0.0)
+    rows = np.flatnonzero(candidates)
+    if len(rows) == 0:
+        return matches
 
-        if not apply_threshold_requirements(
-            occupation,
-            element_type,
-            user_series,
-            required_series,
-            importance_series
-        ):
-            continue
+    # Everything below is scored on the surviving rows only
+    required = required[rows]
+    importance = importance[rows]
+    present = present[rows]
 
-        fit_score, total_weight = calculate_weighted_fit(
-            user_series,
-            required_series,
-            importance_series
+    fit_scores, _ = weighted_fit_rows(
+        user, required, importance, present, OVERQUALIFICATION_DAMPING
+    )
+    cosine_scores = weighted_cosine_rows(user, required, importance, present)
+
+    # Mahalanobis similarity, one covariance factor per pattern of present
+    # elements (normally a single pattern shared by every occupation)
+    mahalanobis_scores = np.full(len(rows), np.nan)
+    patterns, pattern_of_row = np.unique(present, axis=0, return_inverse=True)
+    pattern_of_row = pattern_of_row.ravel()
+    pattern_elements: List[List[str]] = []
+    for p, pattern in enumerate(patterns):
+        pattern_rows = np.flatnonzero(pattern_of_row == p)
+        filtered_elements = [element for element, keep in zip(common_elements, pattern) if keep]
+        pattern_elements.append(filtered_elements)
+
+        factor = _covariance_factor(
+            levels,
+            [column for column, keep in zip(columns, pattern) if keep],
+            tuple(filtered_elements),
+            dataset_cache,
+            full_covariance
         )
-
-        if total_weight == 0:
+        if factor is None:
             continue
+        try:
+            diff = user[pattern] - required[np.ix_(pattern_rows, pattern)]
+            # d' C^-1 d as |L^-1 d|^2, one triangular solve for all rows
+            whitened = solve_triangular(factor, diff.T, lower=True, check_finite=False)
+            m_dist_sq = np.einsum("ij,ij->j", whitened, whitened)
+            denom = max(len(filtered_elements), 1)
+            mahalanobis_scores[pattern_rows] = np.exp(-0.5 * m_dist_sq / denom)
+        except Exception as exc:  # pragma: no cover - numeric robustness
+            logger.debug("Mahalanobis similarity failed for %s (%s)", filtered_elements, exc)
+
+    combined_scores, total_weights = _combine_component_scores(
+        fit_scores, cosine_scores, mahalanobis_scores
+    )
 
-        cosine_score = importance_weighted_cosine(
-            user_series,
-            required_series,
-            importance_series
-        )
-
-        inv_cov = dataset_cache.get(tuple(filtered_elements))
-        mahalanobis_score: Optional[float] = None
-        if inv_cov is None:
-            try:
-                subset_matrix = level_matrix.loc[:, filtered_elements].dropna()
-                if subset_matrix.shape[0] >= len(filtered_elements) and subset_matrix.shape[1] > 0:
-                    cov = np.cov(subset_matrix.to_numpy(dtype=float), rowvar=False)
-                    if cov.ndim == 0:
-                        cov = np.array([[float(cov)]])
-                    cov = cov + (MAHALANOBIS_REGULARIZATION * np.eye(cov.shape[0]))
-                    inv_cov = np.linalg.inv(cov)
-                else:
-                    inv_cov = None
-            except Exception as exc:  # pragma: no cover - numeric robustness
-                logger.debug("Mahalanobis cache build failed for %s (%s)", filtered_elements, exc)
-                inv_cov = None
-            dataset_cache[tuple(filtered_elements)] = inv_cov
-
-        if inv_cov is not None:
-            try:
-                diff = user_series.to_numpy(dtype=float) - required_series.to_numpy(dtype=float)
-                m_dist_sq = float(np.dot(np.dot(diff, inv_cov), diff.T))
-                if m_dist_sq < 0:
-                    m_dist_sq = 0.0
-                denom = max(len(filtered_elements), 1)
-                mahalanobis_score = float(np.exp(-0.5 * m_dist_sq / denom))
-            except Exception as exc:  # pragma: no cover - numeric robustness
-                logger.debug("Mahalanobis similarity failed for %s (%s)", occupation, exc)
-                mahalanobis_score = None
-
-        weights = COMBINATION_WEIGHTS
-        fit_weight = max(float(weights.get('fit', 0.0)), 0.0)
-        cosine_weight = max(float(weights.get('cosine', 0.0)), 0.0)
-        mahal_weight = max(float(weights.get('mahalanobis', 0.0)), 0.0) if mahalanobis_score is not None else 0.0
-
-        total_weight = fit_weight + (cosine_weight if cosine_score is not None else 0.0) + mahal_weight
-        if total_weight <= 0:
-            combined_score = fit_score
-        else:
-            combined_score = (
-                (fit_weight * fit_score)
-                + (cosine_weight * cosine_score if cosine_score is not None else 0.0)
-                + (mahal_weight * mahalanobis_score if mahalanobis_score is not None else 0.0)
-            ) / total_weight
-
-        matches[occupation] = {
-            "score": combined_score,
+    for p, title, combined, total, fit, cosine, mahalanobis in zip(
+        pattern_of_row.tolist(),
+        titles[rows].tolist(),
+        combined_scores.tolist(),
+        total_weights.tolist(),
+        fit_scores.tolist(),
+        cosine_scores.tolist(),
+        mahalanobis_scores.tolist(),
+    ):
+        filtered_elements = pattern_elements[p]
+        matches[title] = {
+            "score": combined,
             "overlap": len(filtered_elements),
             "elements": filtered_elements,
-            "total_weight": total_weight,
-            "fit_score": fit_score,
-            "cosine_score": cosine_score,
-            "mahalanobis_score": mahalanobis_score
+            "total_weight": total,
+            "fit_score": fit,
+            "cosine_score": cosine,
+            "mahalanobis_score": None if mahalanobis != mahalanobis else mahalanobis
         }
 
     return matches
@@ -730,74 +1035,176 @@ def calculate_element_correlations_all(
         return scores, overlaps, matched_elements
 
     try:
-        # Load O*NET data
-        df = db.storage.dataframes.get(dataframe_name)
-        
-        # Filter to the specified scale (Level for most, Importance as option)
-        df_filtered = df[df["Scale Name"] == scale]
-        
-        # Create pivot table: occupations × elements
-        pivot = pd.pivot_table(
-            df_filtered,
-            values="Data Value",
-            index="Title",
-            columns="Element Name",
-            aggfunc="mean"
+        # Cached, normalized pivot table of the specified scale (Level for
+        # most, Importance as option): occupations × elements
+        normalized, titles, element_columns, scaling = _normalized_occupations(
+            dataframe_name, scale, normalization_method
         )
         
         # Create user profile
         user_dict = {item.name: item.rating for item in user_elements}
-        user_profile = pd.Series(user_dict)
         
         # Check minimum overlap threshold BEFORE normalization
-        common_elements = list(
-            set(user_profile.index) & set(pivot.columns)
-        )
+        common_elements = [element for element in user_dict if element in element_columns]
         
         if len(common_elements) < MIN_OVERLAP_THRESHOLD.get(element_type, 3):
             print(f"Warning: Too few common {element_type} elements ({len(common_elements)} < {MIN_OVERLAP_THRESHOLD.get(element_type, 3)})")
             return scores, overlaps, matched_elements
         
-        # Apply normalization to get common elements and normalized values
-        normalized_pivot, normalized_user = normalize_vectors(
-            pivot, user_profile, method=normalization_method
+        print(f"Processing {element_type}: {len(common_elements)} normalized elements")
+        
+        # Normalize the user with the same per-element scaling as the
+        # occupation columns they share
+        columns = [element_columns[element] for element in common_elements]
+        user_vec = _apply_element_scaling(
+            np.array([user_dict[element] for element in common_elements], dtype=float),
+            _select_scaling(scaling, columns),
+            clip=normalization_method == 'minmax'
         )
+        full_moments = None
+        if len(columns) == normalized.shape[1]:
+            full_moments = _normalized_row_moments(dataframe_name, scale, normalization_method)
         
-        if normalized_pivot.empty or normalized_user.empty:
-            print(f"Warning: No common elements found for {element_type} normalization")
-            return scores, overlaps, matched_elements
-            
-        common_elements = list(normalized_user.index)
-        print(f"Processing {element_type}: {len(common_elements)} normalized elements")
+        # Pearson correlation on normalized data for every occupation at
+        # once; occupations missing some ratings are scored over the
+        # elements they do have, subject to the same minimum overlap
+        if full_moments is not None:
+            # Every element was rated: correlate against the cached matrix
+            # itself, with the user put into its column order and the
+            # cached row statistics
+            has_missing = False
+            correlations = vector_pearson(user_vec[np.argsort(columns)], normalized, full_moments)
+        else:
+            occ_matrix = normalized[:, columns]
+            missing = np.isnan(occ_matrix)
+            has_missing = bool(missing.any())
+            if has_missing:
+                correlations, counts = masked_vector_pearson(user_vec, occ_matrix)
+                correlations[counts < MIN_OVERLAP_THRESHOLD.get(element_type, 3)] = np.nan
+            elif len(columns) <= NARROW_MAX_ITEMS:
+                correlations = narrow_vector_pearson(user_vec, occ_matrix)
+            else:
+                correlations = vector_pearson(user_vec, occ_matrix)
         
-        # Process each occupation - now we know all have enough overlap
-        for occupation in normalized_pivot.index:
-            # Get normalized profiles
-            occupation_profile = normalized_pivot.loc[occupation]
-            
-            # Calculate Pearson correlation on normalized data
-            if normalized_user.std() > 0 and occupation_profile.std() > 0:
-                r, _ = pearsonr(normalized_user, occupation_profile)
-                # Convert to 0-1 range
-                score = (r + 1) / 2
-                
-                scores[occupation] = score
-                overlaps[occupation] = len(common_elements)
-                matched_elements[occupation] = common_elements
+        # Occupations or users without variance have no correlation
+        valid = np.flatnonzero(np.isfinite(correlations))
+        titles = titles[valid].tolist()
+        
+        # Convert to 0-1 range; the result dicts are built in bulk rather
+        # than filled per occupation
+        scores = dict(zip(titles, ((correlations[valid] + 1) / 2).tolist()))
+        overlaps = dict.fromkeys(titles, len(common_elements))
+        matched_elements = dict.fromkeys(titles, common_elements)
+        
+        if has_missing:
+            for i in np.flatnonzero(missing[valid].any(axis=1)):
+                present = ~missing[valid[i]]
+                overlaps[titles[i]] = int(present.sum())
+                matched_elements[titles[i]] = [
+                    element for element, keep in zip(common_elements, present) if keep
+                ]
             
     except Exception as e:
         print(f"Error calculating {element_type} correlations: {str(e)}")
         
     return scores, overlaps, matched_elements
 
-def _hexagon_distance(code_a: str, code_b: str) -> int:
+def calculate_element_correlations_batch(
+    users_elements: List[List[Any]],
+    dataframe_name: str,
+    element_type: str,
+    scale: str = "Level",
+    normalization_method: str = 'minmax'
+) -> List[Tuple[Dict[str, float], Dict[str, int], Dict[str, List[str]]]]:
+    """
+    calculate_element_correlations_all for many users at once
+    
+    Users who rated the same set of elements share one normalized
+    occupation matrix and are correlated against it in a single GEMM.
+    Groups whose occupations have missing ratings fall back to scoring
+    each user on their own.
+    
+    Returns:
+        One (scores, overlaps, matched_elements) tuple per user, in order
+    """
+    results: List[Tuple[Dict[str, float], Dict[str, int], Dict[str, List[str]]]] = [
+        ({}, {}, {}) for _ in users_elements
+    ]
+    
+    if db is None:
+        logger.error("Databutton storage unavailable for element correlations")
+        return results
+
     try:
-        idx_a = RIASEC_ORDER.index(code_a)
-        idx_b = RIASEC_ORDER.index(code_b)
-    except ValueError:
-        return 3
-    diff = abs(idx_a - idx_b)
-    return min(diff, 6 - diff)
+        normalized, titles, element_columns, scaling = _normalized_occupations(
+            dataframe_name, scale, normalization_method
+        )
+        min_overlap = MIN_OVERLAP_THRESHOLD.get(element_type, 3)
+        
+        # Group users by the elements they share with the occupation table
+        groups: Dict[frozenset, Tuple[List[str], List[int], List[Dict[str, float]]]] = {}
+        for position, user_elements in enumerate(users_elements):
+            user_dict = {item.name: item.rating for item in user_elements}
+            common_elements = [element for element in user_dict if element in element_columns]
+            if len(common_elements) < min_overlap:
+                continue
+            _, positions, user_dicts = groups.setdefault(
+                frozenset(common_elements), (common_elements, [], [])
+            )
+            positions.append(position)
+            user_dicts.append(user_dict)
+        
+        for common_elements, positions, user_dicts in groups.values():
+            columns = [element_columns[element] for element in common_elements]
+            
+            moments = None
+            if len(columns) == normalized.shape[1]:
+                moments = _normalized_row_moments(dataframe_name, scale, normalization_method)
+            if moments is not None:
+                # Every element was rated: the cached matrix and its row
+                # statistics serve once users are put into its column order
+                user_order = np.argsort(columns)
+                occ_matrix = normalized
+            else:
+                user_order = np.arange(len(columns))
+                occ_matrix = normalized[:, columns]
+            
+            if moments is None and np.isnan(occ_matrix).any():
+                for position in positions:
+                    results[position] = calculate_element_correlations_all(
+                        users_elements[position], dataframe_name, element_type,
+                        scale=scale, normalization_method=normalization_method
+                    )
+                continue
+            
+            users_matrix = np.array(
+                [[user_dict[element] for element in common_elements] for user_dict in user_dicts],
+                dtype=float
+            )
+            users_matrix = _apply_element_scaling(
+                users_matrix,
+                _select_scaling(scaling, columns),
+                clip=normalization_method == 'minmax'
+            )
+            correlations = batch_vector_pearson(users_matrix[:, user_order], occ_matrix, moments)
+            
+            for column, position in enumerate(positions):
+                user_correlations = correlations[:, column]
+                valid = np.flatnonzero(np.isfinite(user_correlations))
+                valid_titles = titles[valid].tolist()
+                results[position] = (
+                    dict(zip(valid_titles, ((user_correlations[valid] + 1) / 2).tolist())),
+                    dict.fromkeys(valid_titles, len(common_elements)),
+                    dict.fromkeys(valid_titles, common_elements),
+                )
+            
+    except Exception as e:
+        logger.error(f"Error calculating batched {element_type} correlations: {str(e)}")
+        
+    return results
+
+def _hexagon_distance(code_a: str, code_b: str) -> int:
+    return int(HEXAGON_DISTANCES[RIASEC_INDEX.get(code_a, 6), RIASEC_INDEX.get(code_b, 6)])
 
 
 def _vectorize_riasec(profile: Dict[str, float]) -> np.ndarray:
@@ -825,10 +1232,11 @@ def calculate_holland_congruence(
     if len(top_user) < 3 or len(top_occ) < 3:
         return 0.0
 
-    discrete_score = 0.0
-    for idx, weight in enumerate(IACHAN_WEIGHTS):
-        dist = _hexagon_distance(top_user[idx], top_occ[idx])
-        discrete_score += max(0.0, weight - dist)
+    distances = HEXAGON_DISTANCES[
+        [RIASEC_INDEX.get(code, 6) for code in top_user],
+        [RIASEC_INDEX.get(code, 6) for code in top_occ]
+    ]
+    discrete_score = float(np.maximum(0, np.subtract(IACHAN_WEIGHTS, distances)).sum())
 
     discrete_component = discrete_score / IACHAN_WEIGHTED_TOTAL
 
@@ -854,10 +1262,73 @@ def calculate_holland_congruence(
     )
 
 
+@lru_cache(maxsize=None)
+def _interest_profiles() -> Tuple[np.ndarray, np.ndarray]:
+    """RIASEC profile of every occupation, loaded once per process.
+
+    Returns an (occupations x 6) matrix with columns in RIASEC_ORDER, NaN
+    where O*NET has no value, and the matching occupation titles.
+    """
+    pivot = _get_pivot("elements-interests-csv", None).reindex(columns=RIASEC_ORDER)
+
+    profiles = pivot.to_numpy(dtype=float)
+    titles = pivot.index.to_numpy()
+    for array in (profiles, titles):
+        array.flags.writeable = False
+
+    return profiles, titles
+
+
+@lru_cache(maxsize=None)
+def _interest_columns(
+    columns: Tuple[int, ...]
+) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """Profiles restricted to some RIASEC columns, with their row moments.
+
+    There are at most 2**6 column subsets, so each is sliced and summed
+    once per process rather than on every request.
+    """
+    profiles, _ = _interest_profiles()
+    occ = profiles if len(columns) == len(RIASEC_ORDER) else profiles[:, list(columns)]
+    return occ, row_moments(occ)
+
+
+@lru_cache(maxsize=None)
+def _interest_congruence_profiles() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """The occupation side of calculate_holland_congruence, once per process.
+
+    Returns each occupation's top three RIASEC indices, how many types it
+    has values for, and the angle and magnitude of its hexagon vector.
+    """
+    profiles, _ = _interest_profiles()
+
+    # O*NET lists interest elements alphabetically; rank in that order so
+    # ties in the top-3 break the same way the per-occupation dicts did
+    alphabetical = np.array(sorted(range(len(RIASEC_ORDER)), key=RIASEC_ORDER.__getitem__))
+    ranked = np.where(np.isnan(profiles), -np.inf, profiles)[:, alphabetical]
+    top_three = alphabetical[np.argsort(-ranked, axis=1, kind="stable")[:, :3]]
+
+    # Row by row through _vectorize_riasec so near-flat profiles, whose
+    # angle is mostly rounding noise, come out exactly as they always have
+    vectors = np.array([
+        _vectorize_riasec(dict(zip(RIASEC_ORDER, row)))
+        for row in np.nan_to_num(profiles, nan=0.0).tolist()
+    ]).reshape(-1, 3)
+
+    result = (top_three, np.arctan2(vectors[:, 1], vectors[:, 0]), vectors[:, 2].copy())
+    for array in result:
+        array.flags.writeable = False
+    return result
+
+
 def calculate_interest_congruence_all(
     user_interests: List[InterestScore]
 ) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, List[str]]]:
-    """Calculate Holland congruence-based interest similarity for occupations."""
+    """Calculate Holland congruence-based interest similarity for occupations.
+
+    Same score as calculate_holland_congruence, computed for every
+    occupation at once against cached occupation profiles.
+    """
     scores: Dict[str, float] = {}
     overlaps: Dict[str, int] = {}
     matched_elements: Dict[str, List[str]] = {}
@@ -867,77 +1338,171 @@ def calculate_interest_congruence_all(
         return scores, overlaps, matched_elements
 
     try:
-        interests_df = db.storage.dataframes.get("elements-interests-csv")
-
-        occupation_interests: Dict[str, Dict[str, float]] = {}
-        for _, row in interests_df.iterrows():
-            occupation = row['Title']
-            interest_type = row['Element Name']
-            value = float(row['Data Value'])
-            occupation_interests.setdefault(occupation, {})[interest_type] = value
+        profiles, titles = _interest_profiles()
+        occ_top_three, occ_angle, occ_magnitude = _interest_congruence_profiles()
 
         user_dict = {item.name: float(item.rating) for item in user_interests}
         total = sum(user_dict.values())
         if total > 0:
             user_dict = {k: v / total for k, v in user_dict.items()}
 
-        for occupation, occ_interests in occupation_interests.items():
-            matched_cats = [cat for cat in RIASEC_ORDER if cat in user_dict and cat in occ_interests]
-            if len(matched_cats) < MIN_OVERLAP_THRESHOLD.get('interests', 3):
-                continue
+        user_has = np.array([cat in user_dict for cat in RIASEC_ORDER])
+        matched_counts = (~np.isnan(profiles) & user_has).sum(axis=1)
+        valid = np.flatnonzero(matched_counts >= MIN_OVERLAP_THRESHOLD.get('interests', 3))
+        if len(valid) == 0:
+            return scores, overlaps, matched_elements
 
-            score = calculate_holland_congruence(user_dict, occ_interests)
-            scores[occupation] = score
-            overlaps[occupation] = len(matched_cats)
+        # Iachan agreement of the top three codes
+        user_sorted = sorted(user_dict.items(), key=lambda kv: kv[1], reverse=True)
+        user_top_three = [RIASEC_INDEX.get(code, 6) for code, _ in user_sorted[:3]]
+        distances = HEXAGON_DISTANCES[user_top_three, occ_top_three[valid]]
+        discrete_score = np.maximum(0, np.subtract(IACHAN_WEIGHTS, distances)).sum(axis=1)
+        discrete_component = discrete_score / IACHAN_WEIGHTED_TOTAL
+
+        # Angular and magnitude similarity of the hexagon vectors
+        user_vec = _vectorize_riasec(user_dict)
+        user_angle = np.arctan2(user_vec[1], user_vec[0])
+        angle_diff = np.abs(user_angle - occ_angle[valid])
+        angle_diff = np.minimum(angle_diff, 2 * np.pi - angle_diff)
+        continuous_component = 0.5 * (1 + np.cos(angle_diff))
+
+        magnitude_diff = np.abs(user_vec[2] - occ_magnitude[valid])
+        magnitude_component = np.maximum(0.0, 1.0 - magnitude_diff)
+
+        continuous_score = (continuous_component * 0.7) + (magnitude_component * 0.3)
+        congruence = (
+            HEXAGON_CONGRUENCE_BLEND * discrete_component
+            + (1 - HEXAGON_CONGRUENCE_BLEND) * continuous_score
+        )
 
-            top_occ = sorted(occ_interests.items(), key=lambda kv: kv[1], reverse=True)
-            matched_elements[occupation] = [cat for cat, _ in top_occ[:3]]
+        valid_titles = titles[valid].tolist()
+        scores = dict(zip(valid_titles, congruence.tolist()))
+        overlaps = dict(zip(valid_titles, matched_counts[valid].tolist()))
+        matched_elements = {
+            title: [RIASEC_ORDER[i] for i in top]
+            for title, top in zip(valid_titles, occ_top_three[valid].tolist())
+        }
 
     except Exception as e:
         logger.error(f"Error calculating interest congruence: {str(e)}")
 
     return scores, overlaps, matched_elements
 
-def aggregate_multi_category_scores(
-    category_matches: Dict[str, Dict[str, Dict[str, Any]]]
-) -> Dict[str, Tuple[float, List[CategoryContribution]]]:
-    """Aggregate matches across categories using dimension weights."""
-    aggregated: Dict[str, Tuple[float, List[CategoryContribution]]] = {}
 
-    all_occupations = set()
-    for matches in category_matches.values():
-        all_occupations.update(matches.keys())
+def calculate_interest_correlations_all(
+    user_interests: List[InterestScore]
+) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, List[str]]]:
+    """Pearson correlation between the user's RIASEC profile and every occupation.
 
-    for occupation in all_occupations:
-        contributions: List[CategoryContribution] = []
-        weighted_sum = 0.0
-        weight_sum = 0.0
+    All occupations are scored at once over the RIASEC types the user
+    rated; scores are mapped to 0-1 as (r + 1) / 2.
+    """
+    scores: Dict[str, float] = {}
+    overlaps: Dict[str, int] = {}
+    matched_elements: Dict[str, List[str]] = {}
 
-        for category, matches in category_matches.items():
-            if occupation not in matches:
-                continue
+    if db is None:
+        logger.error("Databutton storage unavailable for interest correlations")
+        return scores, overlaps, matched_elements
 
-            match = matches[occupation]
-            dimension_weight = DIMENSION_WEIGHTS.get(category, 0.0)
-            if dimension_weight <= 0:
-                continue
+    try:
+        _, titles = _interest_profiles()
+
+        user_dict = {item.name: float(item.rating) for item in user_interests}
+        columns = [i for i, cat in enumerate(RIASEC_ORDER) if cat in user_dict]
+        if len(columns) < MIN_OVERLAP_THRESHOLD.get('interests', 3):
+            return scores, overlaps, matched_elements
+
+        common_elements = [RIASEC_ORDER[i] for i in columns]
+        user_vec = np.array([user_dict[cat] for cat in common_elements])
+
+        # One fixed-width pass over every occupation's RIASEC profile; the
+        # occupation sums and sums of squares are cached per column subset
+        # for when numba is not installed
+        occ, moments = _interest_columns(tuple(columns))
+        r = narrow_vector_pearson(user_vec, occ, moments)
+
+        # Occupations with a flat or incomplete profile have no correlation
+        valid = np.flatnonzero(np.isfinite(r))
+        valid_titles = titles[valid].tolist()
+        scores = dict(zip(valid_titles, ((r[valid] + 1) / 2).tolist()))
+        overlaps = dict.fromkeys(valid_titles, len(common_elements))
+        matched_elements = dict.fromkeys(valid_titles, common_elements)
 
-            weighted_sum += match["score"] * dimension_weight
-            weight_sum += dimension_weight
+    except Exception as e:
+        logger.error(f"Error calculating interest correlations: {str(e)}")
+
+    return scores, overlaps, matched_elements
 
-            contributions.append(CategoryContribution(
-                category=category,
-                score=round(match["score"], 3),
-                weight=round(dimension_weight, 2),
-                overlap_count=match.get("overlap", 0),
-                elements_matched=match.get("elements", [])[:5]
-            ))
+def _aggregate_category_scores(
+    category_matches: Dict[str, Dict[str, Dict[str, Any]]]
+) -> Tuple[List[str], List[str], List[float]]:
+    """Weighted average score of every occupation across the categories
+    with a positive dimension weight.
+
+    Returns those categories, the occupations in first-seen order and
+    their final scores.
+    """
+    categories = [
+        category for category in category_matches
+        if DIMENSION_WEIGHTS.get(category, 0.0) > 0
+    ]
+    if not categories:
+        return categories, [], []
+
+    # Shared occupation index across categories, in first-seen order
+    position: Dict[str, int] = {}
+    for category in categories:
+        for occupation in category_matches[category]:
+            position.setdefault(occupation, len(position))
+
+    # Scatter each category's scores into flat per-occupation sums rather
+    # than filling an occupations x categories matrix
+    weighted_sums = np.zeros(len(position))
+    weight_sums = np.zeros(len(position))
+    for category in categories:
+        matches = category_matches[category]
+        weight = DIMENSION_WEIGHTS[category]
+        rows = np.fromiter(map(position.__getitem__, matches), dtype=np.intp, count=len(matches))
+        scores = np.fromiter(
+            (match["score"] for match in matches.values()), dtype=float, count=len(matches)
+        )
+        weighted_sums[rows] += weight * scores
+        weight_sums[rows] += weight
+
+    return categories, list(position), (weighted_sums / weight_sums).tolist()
+
+
+def _category_contributions(
+    category_matches: Dict[str, Dict[str, Dict[str, Any]]],
+    categories: List[str],
+    occupation: str
+) -> List[CategoryContribution]:
+    """What each of `categories` contributed to one occupation's score"""
+    contributions = []
+    for category in categories:
+        match = category_matches[category].get(occupation)
+        if match is None:
+            continue
+        contributions.append(CategoryContribution.model_construct(
+            category=category,
+            score=round(match["score"], 3),
+            weight=round(float(DIMENSION_WEIGHTS[category]), 2),
+            overlap_count=match.get("overlap", 0),
+            elements_matched=match.get("elements", [])[:5]
+        ))
+    return contributions
 
-        if weight_sum > 0:
-            final_score = weighted_sum / weight_sum
-            aggregated[occupation] = (final_score, contributions)
 
-    return aggregated
+def aggregate_multi_category_scores(
+    category_matches: Dict[str, Dict[str, Dict[str, Any]]]
+) -> Dict[str, Tuple[float, List[CategoryContribution]]]:
+    """Aggregate matches across categories using dimension weights."""
+    categories, occupations, final_scores = _aggregate_category_scores(category_matches)
+    return {
+        occupation: (final_score, _category_contributions(category_matches, categories, occupation))
+        for occupation, final_score in zip(occupations, final_scores)
+    }
 
 
 def compute_aggregated_scores(user_scores: UserScores) -> Dict[str, Tuple[float, List[CategoryContribution]]]:
@@ -947,83 +1512,155 @@ def compute_aggregated_scores(user_scores: UserScores) -> Dict[str, Tuple[float,
     return aggregate_multi_category_scores(category_matches)
 
 
+_ElementScaling = Tuple[np.ndarray, np.ndarray, np.ndarray, float]
+
+
+def _element_scaling(occupation_df: pd.DataFrame, method: str) -> _ElementScaling:
+    """Per-element offset and divisor for normalize_vectors, with the mask of
+    near-constant elements and the value they are set to"""
+    # One reduction per statistic over all elements, broadcast afterwards
+    if method == 'minmax':
+        # Min-max normalization: (x - min) / (max - min)
+        offset = occupation_df.min().to_numpy(dtype=float)
+        divisor = occupation_df.max().to_numpy(dtype=float) - offset
+        fill = 0.5
+    elif method == 'zscore':
+        # Z-score normalization: (x - mean) / std
+        offset = occupation_df.mean().to_numpy(dtype=float)
+        divisor = occupation_df.std().to_numpy(dtype=float, copy=True)
+        fill = 0.0
+    else:
+        raise ValueError(f"Unsupported normalization method: {method}")
+
+    constant = divisor < 1e-8  # Nearly constant columns
+    divisor[constant] = 1.0
+    if constant.any():
+        logger.debug(
+            "%d elements have near-zero spread, setting to %s", int(constant.sum()), fill
+        )
+    return offset, divisor, constant, fill
+
+
+def _select_scaling(scaling: _ElementScaling, columns: List[int]) -> _ElementScaling:
+    """The scaling of a subset of element columns"""
+    offset, divisor, constant, fill = scaling
+    return offset[columns], divisor[columns], constant[columns], fill
+
+
+def _apply_element_scaling(
+    values: np.ndarray,
+    scaling: _ElementScaling,
+    clip: bool = False
+) -> np.ndarray:
+    """Scale the element columns (last axis) of `values`; `clip` bounds
+    min-max scaled users to [0, 1] in case they fall outside the
+    occupation range"""
+    offset, divisor, constant, fill = scaling
+    scaled = (values - offset) / divisor
+    if clip:
+        scaled = np.clip(scaled, 0, 1)
+    scaled[..., constant] = fill
+    return scaled
+
+
+@lru_cache(maxsize=16)
+def _normalized_occupations(
+    dataframe_name: str,
+    scale: str,
+    method: str
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, int], _ElementScaling]:
+    """The pivot of one scale normalized element by element, built once.
+
+    Every element is scaled on its own statistics, so any column subset
+    equals normalize_vectors of that subset. Returns the read-only float32
+    matrix, the occupation titles, the column of each element and the
+    scaling to apply to user ratings.
+    """
+    pivot = _get_pivot(dataframe_name, scale)
+    scaling = _element_scaling(pivot, method)
+    matrix = _apply_element_scaling(pivot.to_numpy(dtype=float), scaling).astype(np.float32)
+    titles = pivot.index.to_numpy()
+    for array in (matrix, titles, *scaling[:3]):
+        array.flags.writeable = False
+
+    element_columns = {element: j for j, element in enumerate(pivot.columns)}
+    return matrix, titles, element_columns, scaling
+
+
+@lru_cache(maxsize=16)
+def _normalized_row_moments(
+    dataframe_name: str,
+    scale: str,
+    method: str
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """row_moments of the full _normalized_occupations matrix, or None when
+    some occupation lacks a rating (those rows are scored masked).
+
+    The moments do not depend on column order, so they serve any user who
+    rated every element.
+    """
+    normalized = _normalized_occupations(dataframe_name, scale, method)[0]
+    if np.isnan(normalized).any():
+        return None
+    return row_moments(normalized)
+
+
 def normalize_vectors(
     occupation_df: pd.DataFrame, 
-    user_series: pd.Series, 
-    method: str = 'minmax'
-) -> Tuple[pd.DataFrame, pd.Series]:
+    user_series: Union[pd.Series, pd.DataFrame, Mapping[str, float]], 
+    method: str = 'minmax',
+    common_elements: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, Union[pd.Series, pd.DataFrame]]:
     """
     Normalize both occupation data and user vector to comparable scales.
     
     Args:
         occupation_df: DataFrame with occupations as rows, elements as columns
-        user_series: Series with user ratings for elements
+        user_series: Series or mapping with user ratings for elements, or a
+            DataFrame with one row of ratings per user
         method: 'minmax' for 0-1 scaling or 'zscore' for z-score normalization
+        common_elements: Elements shared by both inputs, when the caller has
+            already computed them
     
     Returns:
         Tuple of (normalized_occupation_df, normalized_user_series)
         Both will only include common elements/features.
     """
     # Find common elements between user and occupation data
-    common_elements = list(
-        set(user_series.index) & set(occupation_df.columns)
-    )
+    if common_elements is None:
+        common_elements = list(
+            set(user_series.keys()) & set(occupation_df.columns)
+        )
     
     if len(common_elements) == 0:
         logger.warning("No common elements found for normalization")
         return pd.DataFrame(), pd.Series()
     
     # Subset to common elements only
-    occ_subset = occupation_df[common_elements].copy()
-    user_subset = user_series[common_elements].copy()
-    
-    if method == 'minmax':
-        # Min-max normalization: (x - min) / (max - min)
-        for element in common_elements:
-            col_min = occ_subset[element].min()
-            col_max = occ_subset[element].max()
-            
-            # Add epsilon to prevent division by zero
-            range_val = col_max - col_min
-            if range_val < 1e-8:  # Nearly constant column
-                logger.debug(f"Element '{element}' has near-zero variance, setting to 0.5")
-                occ_subset[element] = 0.5
-                user_subset[element] = 0.5
-            else:
-                # Normalize occupation data
-                occ_subset[element] = (occ_subset[element] - col_min) / range_val
-                # Normalize user data using same min/max
-                user_subset[element] = (user_subset[element] - col_min) / range_val
-                # Clip user values to [0,1] in case they fall outside occupation range
-                user_subset[element] = np.clip(user_subset[element], 0, 1)
-    
-    elif method == 'zscore':
-        # Z-score normalization: (x - mean) / std
-        for element in common_elements:
-            col_mean = occ_subset[element].mean()
-            col_std = occ_subset[element].std()
-            
-            # Add epsilon to prevent division by zero
-            if col_std < 1e-8:  # Nearly constant column
-                logger.debug(f"Element '{element}' has near-zero std, setting to 0")
-                occ_subset[element] = 0.0
-                user_subset[element] = 0.0
-            else:
-                # Normalize occupation data
-                occ_subset[element] = (occ_subset[element] - col_mean) / col_std
-                # Normalize user data using same mean/std
-                user_subset[element] = (user_subset[element] - col_mean) / col_std
-    
+    occ_subset = occupation_df[common_elements]
+    if isinstance(user_series, pd.DataFrame):
+        user_subset = user_series[common_elements]
+        user_values = user_subset.to_numpy(dtype=float)
     else:
-        raise ValueError(f"Unsupported normalization method: {method}")
-    
+        user_values = np.array([user_series[element] for element in common_elements], dtype=float)
+
+    scaling = _element_scaling(occ_subset, method)
+    occ_values = _apply_element_scaling(occ_subset.to_numpy(dtype=float), scaling)
+    user_values = _apply_element_scaling(user_values, scaling, clip=method == 'minmax')
+
+    occ_subset = pd.DataFrame(occ_values, index=occ_subset.index, columns=common_elements)
+    if isinstance(user_series, pd.DataFrame):
+        user_subset = pd.DataFrame(user_values, index=user_subset.index, columns=common_elements)
+    else:
+        user_subset = pd.Series(user_values, index=common_elements)
+
     logger.debug(f"Normalized {len(common_elements)} elements using {method} method")
     return occ_subset, user_subset
 
 
 # ============= Parameter Optimization Utilities =============
 
-def _get_first_available(row: pd.Series, candidates: List[str]) -> Any:
+def _get_first_available(row: Mapping[str, Any], candidates: List[str]) -> Any:
     for column in candidates:
         if column in row and row[column] is not None:
             value = row[column]
@@ -1064,30 +1701,42 @@ def _parse_score_items(raw_value: Any, model_cls) -> List[Any]:
     return results
 
 
-def _build_user_scores_from_row(row: pd.Series) -> UserScores:
-    interests = _parse_score_items(
-        _get_first_available(row, ['user_interests', 'interests']),
-        InterestScore
-    )
-    abilities = _parse_score_items(
-        _get_first_available(row, ['user_abilities', 'abilities']),
-        AbilityScore
-    )
-    knowledge = _parse_score_items(
-        _get_first_available(row, ['user_knowledge', 'knowledge']),
-        KnowledgeScore
-    )
-    skills = _parse_score_items(
-        _get_first_available(row, ['user_skills', 'skills']),
-        SkillScore
-    )
+# UserScores field, the validation columns it may come from and its item model
+_USER_SCORE_SOURCES: List[Tuple[str, List[str], Any]] = [
+    ('interests', ['user_interests', 'interests'], InterestScore),
+    ('abilities', ['user_abilities', 'abilities'], AbilityScore),
+    ('knowledge', ['user_knowledge', 'knowledge'], KnowledgeScore),
+    ('skills', ['user_skills', 'skills'], SkillScore),
+]
 
-    return UserScores(
-        interests=interests or None,
-        abilities=abilities or None,
-        knowledge=knowledge or None,
-        skills=skills or None
-    )
+
+def _build_user_scores(raw_values: Mapping[str, Any]) -> UserScores:
+    """UserScores from the raw validation value of each field"""
+    return UserScores(**{
+        field: _parse_score_items(raw_values.get(field), model_cls) or None
+        for field, _, model_cls in _USER_SCORE_SOURCES
+    })
+
+
+def _build_user_scores_from_row(row: Mapping[str, Any]) -> UserScores:
+    return _build_user_scores({
+        field: _get_first_available(row, columns)
+        for field, columns, _ in _USER_SCORE_SOURCES
+    })
+
+
+def _coalesce_columns(df: pd.DataFrame, candidates: List[str]) -> List[Any]:
+    """For every row, the value _get_first_available would pick from
+    `candidates`, resolved a column at a time rather than per row"""
+    values = np.full(len(df), None, dtype=object)
+    missing = np.ones(len(df), dtype=bool)
+    for column in candidates:
+        if column not in df.columns:
+            continue
+        take = missing & df[column].notna().to_numpy()
+        values[take] = df[column].to_numpy(dtype=object)[take]
+        missing &= ~take
+    return values.tolist()
 
 
 def _load_validation_dataframe(dataset_name: str) -> Optional[pd.DataFrame]:
@@ -1116,6 +1765,23 @@ def _normalize_weights(weight_dict: Dict[str, float], expected_keys: List[str])
     return normalized
 
 
+def _unique_normalized_weights(
+    candidates: List[Dict[str, float]],
+    expected_keys: List[str]
+) -> List[Dict[str, float]]:
+    """Normalized candidates in order, dropping any that normalize to the
+    same weights as an earlier one"""
+    unique: List[Dict[str, float]] = []
+    seen: set = set()
+    for candidate in candidates:
+        normalized = _normalize_weights(candidate, expected_keys)
+        key = tuple(round(value, 6) for value in normalized.values())
+        if key not in seen:
+            seen.add(key)
+            unique.append(normalized)
+    return unique
+
+
 def compute_auc(labels: List[int], scores: List[float]) -> Optional[float]:
     if not labels or not scores or len(labels) != len(scores):
         return None
@@ -1127,27 +1793,49 @@ def compute_auc(labels: List[int], scores: List[float]) -> Optional[float]:
     if n_pos == 0 or n_neg == 0:
         return None
 
-    order = np.argsort(scores_array)
-    ranks = np.empty_like(order, dtype=float)
-    ranks[order] = np.arange(len(scores_array)) + 1  # 1-based ranks
-    sum_ranks_pos = ranks[labels_array == 1].sum()
+    # 1-based ranks; tied scores share their average rank
+    ranks = rankdata(scores_array, method='average')
+    sum_ranks_pos = np.sum(ranks, where=labels_array == 1)
     auc = (sum_ranks_pos - (n_pos * (n_pos + 1) / 2.0)) / (n_pos * n_neg)
     return float(auc)
 
 
-def generate_predictions_for_dataset(
+# A parsed validation row: user scores, a key identifying the profile,
+# the label and the occupation it is labelled against
+_ValidationRow = Tuple[UserScores, str, int, str]
+
+
+def _prepare_validation_rows(
     df: pd.DataFrame,
     label_columns: List[str],
     occupation_columns: List[str]
-) -> Tuple[List[int], List[float]]:
-    predictions: List[float] = []
-    labels: List[int] = []
-
-    for _, row in df.iterrows():
-        label_value = _get_first_available(row, label_columns)
-        occupation_value = _get_first_available(row, occupation_columns)
-
-        if occupation_value is None or label_value is None:
+) -> List[_ValidationRow]:
+    """Parse the labelled rows of a validation dataset once, so repeated
+    scoring passes (the optimizer grids) skip the JSON and model parsing"""
+    rows: List[_ValidationRow] = []
+
+    # The source column of each value is resolved once per column
+    fields = [field for field, _, _ in _USER_SCORE_SOURCES]
+    raw_scores = zip(*(_coalesce_columns(df, columns) for _, columns, _ in _USER_SCORE_SOURCES))
+
+    # Occupation titles repeat across rows; factorize them so each distinct
+    # title is converted to a string once and rows share the same object
+    occupation_codes, occupation_values = pd.factorize(
+        pd.Series(_coalesce_columns(df, occupation_columns), dtype=object)
+    )
+    occupation_names = [str(value) for value in occupation_values]
+
+    # Stored as CSV, a user's JSON strings repeat on each of their rows;
+    # parse every distinct profile once (lists are not hashable and are
+    # parsed per row)
+    parsed_profiles: Dict[Tuple[Any, ...], Tuple[UserScores, str]] = {}
+
+    for label_value, occupation_code, raw_values in zip(
+        _coalesce_columns(df, label_columns),
+        occupation_codes.tolist(),
+        raw_scores,
+    ):
+        if occupation_code < 0 or label_value is None:
             continue
 
         try:
@@ -1155,18 +1843,112 @@ def generate_predictions_for_dataset(
         except (TypeError, ValueError):
             continue
 
-        user_scores = _build_user_scores_from_row(row)
-        aggregated = compute_aggregated_scores(user_scores)
-        match = aggregated.get(str(occupation_value))
-        if not match:
+        try:
+            profile = parsed_profiles.get(raw_values)
+        except TypeError:
+            profile = None
+        if profile is None:
+            user_scores = _build_user_scores(dict(zip(fields, raw_values)))
+            profile = (user_scores, user_scores.model_dump_json())
+            if all(value is None or isinstance(value, str) for value in raw_values):
+                parsed_profiles[raw_values] = profile
+
+        rows.append((*profile, label_int, occupation_names[occupation_code]))
+
+    return rows
+
+
+def _recombine_category_matches(
+    category_matches: Dict[str, Dict[str, Dict[str, Any]]]
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Scores of `category_matches` re-blended under the current
+    COMBINATION_WEIGHTS.
+
+    The fit, cosine and Mahalanobis components do not depend on the
+    weights, so this equals rebuilding the matches. Interest matches carry
+    no components and are returned as they are.
+    """
+    recombined: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for category, matches in category_matches.items():
+        if "fit_score" not in next(iter(matches.values())):
+            recombined[category] = matches
+            continue
+
+        def component(name: str) -> np.ndarray:
+            return np.fromiter(
+                (np.nan if match[name] is None else match[name] for match in matches.values()),
+                dtype=float,
+                count=len(matches)
+            )
+
+        combined_scores, _ = _combine_component_scores(
+            component("fit_score"), component("cosine_score"), component("mahalanobis_score")
+        )
+        recombined[category] = {
+            occupation: {"score": score}
+            for occupation, score in zip(matches, combined_scores.tolist())
+        }
+    return recombined
+
+
+def _validation_category_matches(
+    rows: List[_ValidationRow]
+) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+    """build_category_matches of every distinct profile in `rows`"""
+    matches_by_profile: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+    for user_scores, profile_key, _, _ in rows:
+        if profile_key not in matches_by_profile:
+            matches_by_profile[profile_key] = build_category_matches(user_scores)
+    return matches_by_profile
+
+
+def _predict_validation_rows(
+    rows: List[_ValidationRow],
+    matches_by_profile: Optional[Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]] = None
+) -> Tuple[List[int], List[float]]:
+    """Labels and current final scores of the rows whose occupation scored.
+
+    `matches_by_profile` are the _validation_category_matches of the rows,
+    when only the dimension and combination weights changed since they
+    were built; they are re-blended instead of scored again.
+    """
+    predictions: List[float] = []
+    labels: List[int] = []
+    # Rows often repeat a user profile (one per candidate occupation, as
+    # the bootstrap generator writes them); score each profile only once
+    scores_by_profile: Dict[str, Dict[str, float]] = {}
+
+    for user_scores, profile_key, label, occupation in rows:
+        final_scores = scores_by_profile.get(profile_key)
+        if final_scores is None:
+            if matches_by_profile is None:
+                category_matches = build_category_matches(user_scores)
+            else:
+                category_matches = _recombine_category_matches(matches_by_profile[profile_key])
+            # Only the final scores are needed, not the contributions
+            _, occupations, scores = _aggregate_category_scores(category_matches)
+            final_scores = scores_by_profile[profile_key] = dict(zip(occupations, scores))
+        score = final_scores.get(occupation)
+        if score is None:
             continue
 
-        predictions.append(float(match[0]))
-        labels.append(label_int)
+        predictions.append(float(score))
+        labels.append(label)
 
     return labels, predictions
 
 
+def generate_predictions_for_dataset(
+    df: pd.DataFrame,
+    label_columns: List[str],
+    occupation_columns: List[str]
+) -> Tuple[List[int], List[float]]:
+    return _predict_validation_rows(
+        _prepare_validation_rows(df, label_columns, occupation_columns)
+    )
+
+
+@_holds_scoring_state_lock
 def optimize_weights_from_dataset(
     dataset_name: str,
     dimension_candidates: Optional[List[Dict[str, float]]] = None,
@@ -1193,14 +1975,25 @@ def optimize_weights_from_dataset(
 
     label_columns = ['label', 'success', 'outcome']
     occupation_columns = ['occupation', 'target_occupation', 'job', 'title']
+    rows = _prepare_validation_rows(df, label_columns, occupation_columns)
+
+    # Candidates that normalize to the same weights score identically, so
+    # each distinct pair is evaluated once
+    dimension_grid = _unique_normalized_weights(
+        default_dimension_candidates, list(DEFAULT_DIMENSION_WEIGHTS.keys())
+    )
+    combination_grid = _unique_normalized_weights(
+        default_combination_candidates, list(DEFAULT_COMBINATION_WEIGHTS.keys())
+    )
 
-    for dim_candidate in default_dimension_candidates:
-        normalized_dim = _normalize_weights(dim_candidate, list(DEFAULT_DIMENSION_WEIGHTS.keys()))
-        for comb_candidate in default_combination_candidates:
-            normalized_comb = _normalize_weights(comb_candidate, list(DEFAULT_COMBINATION_WEIGHTS.keys()))
+    # The weights only blend and aggregate the per-category scores, so each
+    # profile is scored once and every grid point re-blends those scores
+    matches_by_profile = _validation_category_matches(rows)
 
+    for normalized_dim in dimension_grid:
+        for normalized_comb in combination_grid:
             with temporary_weight_overrides(normalized_dim, normalized_comb):
-                labels, predictions = generate_predictions_for_dataset(df, label_columns, occupation_columns)
+                labels, predictions = _predict_validation_rows(rows, matches_by_profile)
 
             auc = compute_auc(labels, predictions)
             if auc is None:
@@ -1223,6 +2016,7 @@ def optimize_weights_from_dataset(
     return best_result
 
 
+@_holds_scoring_state_lock
 def optimize_thresholds_from_dataset(
     dataset_name: str,
     importance_candidates: Optional[List[float]] = None,
@@ -1238,13 +2032,14 @@ def optimize_thresholds_from_dataset(
 
     label_columns = ['label', 'success', 'outcome']
     occupation_columns = ['occupation', 'target_occupation', 'job', 'title']
+    rows = _prepare_validation_rows(df, label_columns, occupation_columns)
 
     best_result: Optional[Dict[str, Any]] = None
 
     for imp_thr in importance_values:
         for ratio in ratio_values:
             with temporary_threshold_overrides(imp_thr, ratio):
-                labels, predictions = generate_predictions_for_dataset(df, label_columns, occupation_columns)
+                labels, predictions = _predict_validation_rows(rows)
 
             auc = compute_auc(labels, predictions)
             if auc is None:
@@ -1277,29 +2072,57 @@ def platt_scale(
     max_iter: int = 500,
     regularization: float = 1e-4
 ) -> Tuple[float, float, int]:
-    A = 0.0
+    """Fit sigmoid(A * score + B) to the labels by L2-regularised log-loss.
+
+    Solved with L-BFGS-B, which converges in a few dozen iterations.
+    `learning_rate` belonged to the earlier fixed-step gradient descent; it
+    is ignored, and passing anything but the default is deprecated.
+    """
+    if learning_rate != 0.01:
+        warnings.warn(
+            "platt_scale no longer uses learning_rate; it is ignored",
+            DeprecationWarning,
+            stacklevel=2
+        )
+
     n_pos = labels.sum()
     n_neg = len(labels) - n_pos
     if n_pos == 0 or n_neg == 0:
         return 0.0, 0.0, 0
 
-    B = float(np.log((n_pos + 1) / (n_neg + 1)))
-
-    for iteration in range(1, max_iter + 1):
-        logits = A * scores + B
-        preds = 1.0 / (1.0 + np.exp(-logits))
-        error = preds - labels
-
-        grad_A = (error * scores).mean() + regularization * A
-        grad_B = error.mean() + regularization * B
-
-        A -= learning_rate * grad_A
-        B -= learning_rate * grad_B
-
-        if max(abs(grad_A), abs(grad_B)) < 1e-6:
-            return float(A), float(B), iteration
+    # Work buffers shared by every evaluation of the objective
+    logits = np.empty(len(scores))
+    error = np.empty(len(scores))
+    terms = np.empty(len(scores))
+    products = np.empty(len(scores))
+
+    def loss_and_grad(params: np.ndarray) -> Tuple[float, np.ndarray]:
+        A, B = params
+        np.add(np.multiply(scores, A, out=logits), B, out=logits)
+        np.subtract(expit(logits, out=error), labels, out=error)
+        # log(1 + e^z) - y * z is the log-loss without overflow
+        np.subtract(
+            np.logaddexp(0.0, logits, out=terms),
+            np.multiply(labels, logits, out=products),
+            out=terms
+        )
+        loss = terms.mean() + 0.5 * regularization * (A * A + B * B)
+        grad = np.array([
+            np.multiply(error, scores, out=products).mean() + regularization * A,
+            error.mean() + regularization * B,
+        ])
+        return float(loss), grad
 
-    return float(A), float(B), max_iter
+    B = float(np.log((n_pos + 1) / (n_neg + 1)))
+    result = minimize(
+        loss_and_grad,
+        x0=np.array([0.0, B]),
+        jac=True,
+        method='L-BFGS-B',
+        options={'maxiter': max_iter, 'gtol': 1e-6}
+    )
+    A, B = result.x
+    return float(A), float(B), int(result.nit)
 
 
 def apply_score_calibration(score: float) -> float:
@@ -1308,10 +2131,11 @@ def apply_score_calibration(score: float) -> float:
 
     A = float(SCORE_CALIBRATION.get('A', 0.0))
     B = float(SCORE_CALIBRATION.get('B', 0.0))
-    calibrated = 1.0 / (1.0 + np.exp(-(A * score + B)))
-    return float(np.clip(calibrated, 0.0, 1.0))
+    # expit stays within [0, 1] and does not overflow on extreme logits
+    return float(expit(A * score + B))
 
 
+@_holds_scoring_state_lock
 def calibrate_scores_from_dataset(
     dataset_name: str,
     learning_rate: float = 0.01,
@@ -1335,7 +2159,7 @@ def calibrate_scores_from_dataset(
     labels_array = np.array(labels, dtype=float)
 
     A, B, iterations = platt_scale(scores_array, labels_array, learning_rate=learning_rate, max_iter=max_iter)
-    calibrated_scores = 1.0 / (1.0 + np.exp(-(A * scores_array + B)))
+    calibrated_scores = expit(A * scores_array + B)
     auc_after = compute_auc(labels, calibrated_scores.tolist())
 
     SCORE_CALIBRATION = {
@@ -1421,6 +2245,7 @@ class BootstrapValidationResponse(BaseModel):
     negatives: int
 
 @router.post("/analyze")
+@_holds_scoring_state_lock
 def analyze_results(user_scores: UserScores) -> RecommendationResponse:
     """
     Original single-category endpoint (backward compatibility)
@@ -1445,8 +2270,51 @@ def analyze_results(user_scores: UserScores) -> RecommendationResponse:
         methodology="Single category correlation"
     )
 
+@router.post("/analyze-batch")
+@_holds_scoring_state_lock
+def analyze_results_batch(batch: List[UserScores]) -> List[RecommendationResponse]:
+    """
+    /analyze for many users at once. Users whose primary category is the
+    same element table are correlated together in one matrix multiply.
+    """
+    categories = [_determine_primary_category(user_scores) for user_scores in batch]
+    if "" in categories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Insufficient assessment data for user {categories.index('')}"
+        )
+    
+    matches: List[List[OccupationMatch]] = [[] for _ in batch]
+    for category, (dataframe_name, _) in _LEGACY_ELEMENT_SOURCES.items():
+        positions = [i for i, primary in enumerate(categories) if primary == category]
+        if not positions:
+            continue
+        results = calculate_element_correlations_batch(
+            [getattr(batch[i], category) for i in positions],
+            dataframe_name,
+            category,
+            scale="Level",
+            normalization_method='minmax'
+        )
+        for position, (scores, overlaps, _) in zip(positions, results):
+            matches[position] = _element_matches(category, scores, overlaps)
+    
+    for position, primary in enumerate(categories):
+        if primary == "interests":
+            matches[position] = _get_interest_recommendations(batch[position].interests)
+    
+    return [
+        RecommendationResponse(
+            matches=category_matches,
+            category=category,
+            methodology="Single category correlation"
+        )
+        for category_matches, category in zip(matches, categories)
+    ]
+
 @router.get("/calibration")
-async def get_calibration() -> CalibrationResponse:
+@_holds_scoring_state_lock
+def get_calibration() -> CalibrationResponse:
     """Return the current calibration values and a small sample of rules."""
     sample = CRITICAL_REQUIREMENTS[:5]
     return CalibrationResponse(
@@ -1460,12 +2328,16 @@ async def get_calibration() -> CalibrationResponse:
     )
 
 @router.post("/calibrate")
-async def calibrate(req: CalibrationRequest) -> CalibrationResponse:
+@_holds_scoring_state_lock
+def calibrate(req: CalibrationRequest) -> CalibrationResponse:
     """Re-run calibration using live O*NET frames from Databutton storage."""
     if db is None:
         raise HTTPException(status_code=503, detail="Databutton storage unavailable in this environment")
     global IMPORTANCE_CRITICAL_THRESHOLD, MIN_REQUIREMENT_RATIO, CRITICAL_REQUIREMENTS
 
+    # Pick up O*NET tables re-uploaded since they were first cached
+    _clear_onet_caches()
+
     top_k = int(req.top_k or 20)
     dataset_used = False
 
@@ -1506,7 +2378,8 @@ async def calibrate(req: CalibrationRequest) -> CalibrationResponse:
     )
 
 @router.post("/optimize-weights")
-async def optimize_weights(req: OptimizationRequest) -> OptimizationResponse:
+@_holds_scoring_state_lock
+def optimize_weights(req: OptimizationRequest) -> OptimizationResponse:
     if db is None:
         raise HTTPException(status_code=503, detail="Databutton storage unavailable in this environment")
 
@@ -1528,7 +2401,8 @@ async def optimize_weights(req: OptimizationRequest) -> OptimizationResponse:
 
 
 @router.post("/calibrate-scores")
-async def calibrate_scores(req: ScoreCalibrationRequest) -> ScoreCalibrationResponse:
+@_holds_scoring_state_lock
+def calibrate_scores(req: ScoreCalibrationRequest) -> ScoreCalibrationResponse:
     if db is None:
         raise HTTPException(status_code=503, detail="Databutton storage unavailable in this environment")
 
@@ -1545,7 +2419,7 @@ async def calibrate_scores(req: ScoreCalibrationRequest) -> ScoreCalibrationResp
 
 
 @router.post("/bootstrap-validation")
-async def bootstrap_validation(req: BootstrapValidationRequest) -> BootstrapValidationResponse:
+def bootstrap_validation(req: BootstrapValidationRequest) -> BootstrapValidationResponse:
     """Generate a synthetic validation dataset from O*NET frames.
 
     Builds user-like profiles from top Level×Importance features of each occupation
@@ -1557,19 +2431,18 @@ async def bootstrap_validation(req: BootstrapValidationRequest) -> BootstrapVali
 
     try:
         # Load frames
-        abil = db.storage.dataframes.get("elements-abilities-csv")
-        skl = db.storage.dataframes.get("elements-skills-csv")
-        knw = db.storage.dataframes.get("elements-knowledge-2-csv")
-        itx = db.storage.dataframes.get("elements-interests-csv") if req.include_interests else None
+        abil = _get_elements_df("elements-abilities-csv")
+        skl = _get_elements_df("elements-skills-csv")
+        knw = _get_elements_df("elements-knowledge-2-csv")
+        itx = _get_elements_df("elements-interests-csv") if req.include_interests else None
 
         if abil is None or skl is None or knw is None:
             raise HTTPException(status_code=503, detail="Required O*NET frames missing")
 
         # Helper to compute top-N element lists per occupation
-        def topn(df: pd.DataFrame, n: int) -> Dict[str, List[Tuple[str, float]]]:
-            df_imp = df[df["Scale Name"] == "Importance"][["Title", "Element Name", "Data Value"]]
-            df_lvl = df[df["Scale Name"] == "Level"]["Data Value"]
-            merged = df[df["Scale Name"] == "Level"][['Title', 'Element Name', 'Data Value']].copy()
+        def topn(dataframe_name: str, n: int) -> Dict[str, List[Tuple[str, float]]]:
+            df_imp = _scale_rows(dataframe_name, "Importance")
+            merged = _scale_rows(dataframe_name, "Level").copy()
             merged.rename(columns={"Data Value": "Level"}, inplace=True)
             df_imp2 = df_imp.rename(columns={"Data Value": "Importance"})
             merged = merged.merge(df_imp2, on=["Title", "Element Name"], how="left")
@@ -1577,12 +2450,15 @@ async def bootstrap_validation(req: BootstrapValidationRequest) -> BootstrapVali
             top_map: Dict[str, List[Tuple[str, float]]] = {}
             for title, grp in merged.groupby("Title"):
                 top = grp.sort_values("score", ascending=False).head(n)
-                top_map[str(title)] = [(str(r["Element Name"]), float(r["Level"])) for _, r in top.iterrows()]
+                top_map[str(title)] = [
+                    (str(name), float(level))
+                    for name, level in zip(top["Element Name"].tolist(), top["Level"].tolist())
+                ]
             return top_map
 
-        top_abil = topn(abil, int(req.topn_abilities or 0)) if (req.topn_abilities or 0) > 0 else {}
-        top_skl = topn(skl, int(req.topn_skills or 0)) if (req.topn_skills or 0) > 0 else {}
-        top_knw = topn(knw, int(req.topn_knowledge or 0)) if (req.topn_knowledge or 0) > 0 else {}
+        top_abil = topn("elements-abilities-csv", int(req.topn_abilities or 0)) if (req.topn_abilities or 0) > 0 else {}
+        top_skl = topn("elements-skills-csv", int(req.topn_skills or 0)) if (req.topn_skills or 0) > 0 else {}
+        top_knw = topn("elements-knowledge-2-csv", int(req.topn_knowledge or 0)) if (req.topn_knowledge or 0) > 0 else {}
 
         occ_titles = sorted(set(top_abil.keys()) | set(top_skl.keys()) | set(top_knw.keys()))
         if req.sample_occupations and req.sample_occupations > 0:
@@ -1591,9 +2467,9 @@ async def bootstrap_validation(req: BootstrapValidationRequest) -> BootstrapVali
         # Precompute occupation interest profiles
         occ_interests: Dict[str, Dict[str, float]] = {}
         if itx is not None:
-            for _, row in itx.iterrows():
-                t = str(row['Title'])
-                occ_interests.setdefault(t, {})[str(row['Element Name'])] = float(row['Data Value'])
+            interest_rows = itx[['Title', 'Element Name', 'Data Value']].itertuples(index=False, name=None)
+            for t, element, value in interest_rows:
+                occ_interests.setdefault(str(t), {})[str(element)] = float(value)
 
         rng = np.random.default_rng()
         rows: List[Dict[str, Any]] = []
@@ -1673,6 +2549,7 @@ async def bootstrap_validation(req: BootstrapValidationRequest) -> BootstrapVali
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Bootstrap generation failed: {exc}")
 @router.post("/analyze-multi")
+@_holds_scoring_state_lock
 def analyze_multi_category(user_scores: UserScores) -> RecommendationResponse:
     """
     New multi-category weighted aggregation endpoint
@@ -1700,18 +2577,15 @@ def analyze_multi_category(user_scores: UserScores) -> RecommendationResponse:
         )
     
     # Step 3: Aggregate scores
-    aggregated = aggregate_multi_category_scores(category_matches)
+    categories, occupations, final_scores = _aggregate_category_scores(category_matches)
     
-    # Step 4: Sort and create response
-    sorted_occupations = sorted(
-        aggregated.items(),
-        key=lambda x: x[1][0],  # Sort by final score
-        reverse=True
-    )
+    # Step 4: Select the top 20 by final score and create response
+    top_occupations = _top_scores(dict(zip(occupations, final_scores)))
     
-    # Create match objects
+    # Create match objects; contributions are only built for the top 20
     matches = []
-    for occupation, (score, contributions) in sorted_occupations[:20]:
+    for occupation, score in top_occupations:
+        contributions = _category_contributions(category_matches, categories, occupation)
         # Generate description based on top contributing categories
         top_categories = sorted(
             contributions, 
@@ -1737,7 +2611,7 @@ def analyze_multi_category(user_scores: UserScores) -> RecommendationResponse:
         matches=matches,
         category="combined",
         methodology=f"Importance-weighted multi-category aggregation using {len(category_matches)} assessment types",
-        total_occupations_analyzed=len(aggregated),
+        total_occupations_analyzed=len(occupations),
         categories_used=list(category_matches.keys())
     )
 
@@ -1763,100 +2637,82 @@ def _determine_primary_category(user_scores: UserScores) -> str:
     
     return primary_category
 
-def _calculate_skill_correlations(user_skills: List[SkillScore]) -> List[OccupationMatch]:
-    """Legacy single-category skill correlation"""
-    scores, overlaps, elements = calculate_element_correlations_all(
-        user_skills,
-        "elements-skills-csv",
-        'skills',
-        scale="Level",
-        normalization_method='minmax'
-    )
-    
-    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    
+def _top_scores(scores: Dict[str, float], limit: int = 20) -> List[Tuple[str, float]]:
+    """Highest scores in descending order, ties kept in insertion order.
+
+    Same result as sorting every item and slicing, without the full sort.
+    """
+    if len(scores) <= limit:
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+    names = list(scores)
+    values = np.fromiter(scores.values(), dtype=float, count=len(names))
+
+    # Everything tied with the limit-th best value stays a candidate so the
+    # stable sort below picks the same entries as a full sort would
+    cutoff = np.partition(values, len(values) - limit)[len(values) - limit]
+    candidates = np.flatnonzero(values >= cutoff)
+    candidates = candidates[np.argsort(-values[candidates], kind="stable")][:limit]
+
+    return [(names[i], scores[names[i]]) for i in candidates]
+
+# Legacy element categories: O*NET table and the noun used in descriptions
+_LEGACY_ELEMENT_SOURCES: Dict[str, Tuple[str, str]] = {
+    'skills': ("elements-skills-csv", "skills"),
+    'abilities': ("elements-abilities-csv", "abilities"),
+    'knowledge': ("elements-knowledge-2-csv", "knowledge areas"),
+}
+
+def _legacy_matches(scores: Dict[str, float], describe: Callable[[str], str]) -> List[OccupationMatch]:
+    """Top 20 occupations of a single-category result as OccupationMatch"""
     matches = []
-    for occupation, score in sorted_scores[:20]:
+    for occupation, score in _top_scores(scores):
         raw_score = float(score)
         calibrated_score = apply_score_calibration(raw_score)
         matches.append(OccupationMatch(
             title=occupation,
             correlation=round(calibrated_score, 3),
-            description=f"Based on {overlaps[occupation]} matching skills",
+            description=describe(occupation),
             raw_score=round(raw_score, 3),
             calibrated=SCORE_CALIBRATION.get('enabled', False)
         ))
     
     return matches
 
-def _calculate_ability_correlations(user_abilities: List[AbilityScore]) -> List[OccupationMatch]:
-    """Legacy single-category ability correlation"""
+def _element_matches(
+    category: str,
+    scores: Dict[str, float],
+    overlaps: Dict[str, int]
+) -> List[OccupationMatch]:
+    noun = _LEGACY_ELEMENT_SOURCES[category][1]
+    return _legacy_matches(
+        scores, lambda occupation: f"Based on {overlaps[occupation]} matching {noun}"
+    )
+
+def _element_recommendations(user_elements: List[Any], category: str) -> List[OccupationMatch]:
+    """Legacy single-category correlation for skills, abilities or knowledge"""
     scores, overlaps, elements = calculate_element_correlations_all(
-        user_abilities,
-        "elements-abilities-csv",
-        'abilities',
+        user_elements,
+        _LEGACY_ELEMENT_SOURCES[category][0],
+        category,
         scale="Level",
         normalization_method='minmax'
     )
-    
-    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    
-    matches = []
-    for occupation, score in sorted_scores[:20]:
-        raw_score = float(score)
-        calibrated_score = apply_score_calibration(raw_score)
-        matches.append(OccupationMatch(
-            title=occupation,
-            correlation=round(calibrated_score, 3),
-            description=f"Based on {overlaps[occupation]} matching abilities",
-            raw_score=round(raw_score, 3),
-            calibrated=SCORE_CALIBRATION.get('enabled', False)
-        ))
-    
-    return matches
+    return _element_matches(category, scores, overlaps)
+
+def _calculate_skill_correlations(user_skills: List[SkillScore]) -> List[OccupationMatch]:
+    """Legacy single-category skill correlation"""
+    return _element_recommendations(user_skills, 'skills')
+
+def _calculate_ability_correlations(user_abilities: List[AbilityScore]) -> List[OccupationMatch]:
+    """Legacy single-category ability correlation"""
+    return _element_recommendations(user_abilities, 'abilities')
 
 def _calculate_knowledge_correlations(user_knowledge: List[KnowledgeScore]) -> List[OccupationMatch]:
     """Legacy single-category knowledge correlation"""
-    scores, overlaps, elements = calculate_element_correlations_all(
-        user_knowledge,
-        "elements-knowledge-2-csv",
-        'knowledge',
-        scale="Level",
-        normalization_method='minmax'
-    )
-    
-    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    
-    matches = []
-    for occupation, score in sorted_scores[:20]:
-        raw_score = float(score)
-        calibrated_score = apply_score_calibration(raw_score)
-        matches.append(OccupationMatch(
-            title=occupation,
-            correlation=round(calibrated_score, 3),
-            description=f"Based on {overlaps[occupation]} matching knowledge areas",
-            raw_score=round(raw_score, 3),
-            calibrated=SCORE_CALIBRATION.get('enabled', False)
-        ))
-    
-    return matches
+    return _element_recommendations(user_knowledge, 'knowledge')
 
 def _get_interest_recommendations(user_interests: List[InterestScore]) -> List[OccupationMatch]:
     """Legacy single-category interest recommendations"""
     scores, overlaps, elements = calculate_interest_correlations_all(user_interests)
-    
-    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    
-    matches = []
-    for occupation, score in sorted_scores[:20]:
-        raw_score = float(score)
-        calibrated_score = apply_score_calibration(raw_score)
-        matches.append(OccupationMatch(
-            title=occupation,
-            correlation=round(calibrated_score, 3),
-            description=f"Based on RIASEC interest profile",
-            raw_score=round(raw_score, 3),
-            calibrated=SCORE_CALIBRATION.get('enabled', False)
-        ))
-    
-    return matches
+    return _legacy_matches(scores, lambda occupation: "Based on RIASEC interest profile")
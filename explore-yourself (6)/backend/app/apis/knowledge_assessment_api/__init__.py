@@ -1,10 +1,18 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+import re
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from fastapi import APIRouter, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 import databutton as db
 
-router = APIRouter()
+from app.libs.responses import DefaultJSONResponse
+
+router = APIRouter(default_response_class=DefaultJSONResponse)
 
 class KnowledgeQuestion(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     description: str
@@ -29,20 +37,24 @@ class KnowledgeResult(BaseModel):
 class CalculateResultsData(BaseModel):
     results: list[KnowledgeResult]
 
+# Map knowledge areas to categories, checked in order; the first category with a term
+# contained in the element name wins
+KNOWLEDGE_CATEGORIES = [
+    ('Technical', ['Design', 'Engineering', 'Building', 'Computers', 'Electronics', 'Mathematics', 'Physics']),
+    ('Science', ['Chemistry', 'Biology', 'Psychology', 'Sociology', 'Geography']),
+    ('Business', ['Economics', 'Sales', 'Marketing', 'Customer Service', 'Personnel', 'Management']),
+    ('Arts & Humanities', ['Fine Arts', 'History', 'Philosophy', 'Language', 'Communications']),
+]
+
+# One case-insensitive alternation per category, compiled at import
+_KNOWLEDGE_CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(map(re.escape, terms)), re.IGNORECASE))
+    for category, terms in KNOWLEDGE_CATEGORIES
+]
+
 def categorize_knowledge(name: str) -> str:
-    # Map knowledge areas to categories
-    technical = ['Design', 'Engineering', 'Building', 'Computers', 'Electronics', 'Mathematics', 'Physics']
-    science = ['Chemistry', 'Biology', 'Psychology', 'Sociology', 'Geography']
-    business = ['Economics', 'Sales', 'Marketing', 'Customer Service', 'Personnel', 'Management']
-    arts = ['Fine Arts', 'History', 'Philosophy', 'Language', 'Communications']
-    
-    for category, items in [
-        ('Technical', technical),
-        ('Science', science),
-        ('Business', business),
-        ('Arts & Humanities', arts)
-    ]:
-        if any(item.lower() in name.lower() for item in items):
+    for category, pattern in _KNOWLEDGE_CATEGORY_PATTERNS:
+        if pattern.search(name):
             return category
     
     return 'Other'
@@ -91,17 +103,42 @@ def parse_knowledge_questions():
 
     return questions
 
-@router.get("/get_knowledge_questions")
-def get_knowledge_questions() -> list[KnowledgeQuestion]:
+# Questions by id and the encoded GET body, kept from the first read of
+# storage that yields any questions
+_knowledge_question_cache: Optional[tuple[Mapping[int, KnowledgeQuestion], bytes]] = None
+
+def _knowledge_questions() -> tuple[Mapping[int, KnowledgeQuestion], bytes]:
+    """Read-only question map and GET response body, parsed once.
+
+    An empty read is not kept, so the next request tries storage again.
+    """
+    global _knowledge_question_cache
+    if _knowledge_question_cache is not None:
+        return _knowledge_question_cache
+
+    questions = [KnowledgeQuestion(**q) for q in parse_knowledge_questions()]
+    parsed = (
+        MappingProxyType({q.id: q for q in questions}),
+        TypeAdapter(list[KnowledgeQuestion]).dump_json(questions),
+    )
+    if questions:
+        _knowledge_question_cache = parsed
+    return parsed
+
+def clear_knowledge_question_cache() -> None:
+    """Parse the questions from storage again on the next request"""
+    global _knowledge_question_cache
+    _knowledge_question_cache = None
+
+@router.get("/get_knowledge_questions", response_model=list[KnowledgeQuestion])
+def get_knowledge_questions() -> Response:
     """Get all knowledge assessment questions"""
-    questions = parse_knowledge_questions()
-    return [KnowledgeQuestion(**q) for q in questions]
+    return Response(content=_knowledge_questions()[1], media_type="application/json")
 
 @router.post("/calculate_knowledge_results")
 def calculate_knowledge_results(body: AnswersRequest) -> CalculateResultsData:
     """Calculate knowledge assessment results based on answers"""
-    questions = parse_knowledge_questions()
-    question_map = {q['id']: q for q in questions}
+    question_map, _ = _knowledge_questions()
     
     results = []
     for answer in body.answers:
@@ -110,9 +147,9 @@ def calculate_knowledge_results(body: AnswersRequest) -> CalculateResultsData:
         results.append(KnowledgeResult(
             questionId=answer.questionId,
             score=answer.rating,
-            name=question['name'],
-            category=question['category'],
-            description=question['description']
+            name=question.name,
+            category=question.category,
+            description=question.description
         ))
     
     return CalculateResultsData(results=results)
@@ -1,10 +1,18 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+import re
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from fastapi import APIRouter, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 import databutton as db
 
-router = APIRouter()
+from app.libs.responses import DefaultJSONResponse
+
+router = APIRouter(default_response_class=DefaultJSONResponse)
 
 class SkillQuestion(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     description: str
@@ -29,24 +37,26 @@ class SkillResult(BaseModel):
 class CalculateResultsData(BaseModel):
     results: list[SkillResult]
 
+# Map skill areas to categories, checked in order; the first category with a term
+# contained in the element name wins
+SKILL_CATEGORIES = [
+    ('Basic Skills', ['Reading', 'Writing', 'Speaking', 'Listening', 'Mathematics', 'Science']),
+    ('Complex Problem Solving', ['Critical Thinking', 'Active Learning', 'Learning Strategies', 'Monitoring']),
+    ('Social Skills', ['Social Perceptiveness', 'Coordination', 'Persuasion', 'Negotiation', 'Instructing', 'Service']),
+    ('Technical Skills', ['Equipment Selection', 'Installation', 'Programming', 'Quality Control', 'Operation and Control', 'Equipment Maintenance']),
+    ('Systems Skills', ['Systems Analysis', 'Systems Evaluation', 'Judgment and Decision Making', 'Time Management']),
+    ('Resource Management', ['Management of Financial Resources', 'Management of Material Resources', 'Management of Personnel Resources']),
+]
+
+# One case-insensitive alternation per category, compiled at import
+_SKILL_CATEGORY_PATTERNS = [
+    (category, re.compile('|'.join(map(re.escape, terms)), re.IGNORECASE))
+    for category, terms in SKILL_CATEGORIES
+]
+
 def categorize_skill(name: str) -> str:
-    # Map skill areas to categories
-    basic = ['Reading', 'Writing', 'Speaking', 'Listening', 'Mathematics', 'Science']
-    complex = ['Critical Thinking', 'Active Learning', 'Learning Strategies', 'Monitoring']
-    social = ['Social Perceptiveness', 'Coordination', 'Persuasion', 'Negotiation', 'Instructing', 'Service']
-    technical = ['Equipment Selection', 'Installation', 'Programming', 'Quality Control', 'Operation and Control', 'Equipment Maintenance']
-    systems = ['Systems Analysis', 'Systems Evaluation', 'Judgment and Decision Making', 'Time Management']
-    resource = ['Management of Financial Resources', 'Management of Material Resources', 'Management of Personnel Resources']
-    
-    for category, items in [
-        ('Basic Skills', basic),
-        ('Complex Problem Solving', complex),
-        ('Social Skills', social),
-        ('Technical Skills', technical),
-        ('Systems Skills', systems),
-        ('Resource Management', resource)
-    ]:
-        if any(item.lower() in name.lower() for item in items):
+    for category, pattern in _SKILL_CATEGORY_PATTERNS:
+        if pattern.search(name):
             return category
     
     return 'Other'
@@ -95,17 +105,42 @@ def parse_skill_questions():
 
     return questions
 
-@router.get("/get_skill_questions")
-def get_skill_questions() -> list[SkillQuestion]:
+# Questions by id and the encoded GET body, kept from the first read of
+# storage that yields any questions
+_skill_question_cache: Optional[tuple[Mapping[int, SkillQuestion], bytes]] = None
+
+def _skill_questions() -> tuple[Mapping[int, SkillQuestion], bytes]:
+    """Read-only question map and GET response body, parsed once.
+
+    An empty read is not kept, so the next request tries storage again.
+    """
+    global _skill_question_cache
+    if _skill_question_cache is not None:
+        return _skill_question_cache
+
+    questions = [SkillQuestion(**q) for q in parse_skill_questions()]
+    parsed = (
+        MappingProxyType({q.id: q for q in questions}),
+        TypeAdapter(list[SkillQuestion]).dump_json(questions),
+    )
+    if questions:
+        _skill_question_cache = parsed
+    return parsed
+
+def clear_skill_question_cache() -> None:
+    """Parse the questions from storage again on the next request"""
+    global _skill_question_cache
+    _skill_question_cache = None
+
+@router.get("/get_skill_questions", response_model=list[SkillQuestion])
+def get_skill_questions() -> Response:
     """Get all skill assessment questions"""
-    questions = parse_skill_questions()
-    return [SkillQuestion(**q) for q in questions]
+    return Response(content=_skill_questions()[1], media_type="application/json")
 
 @router.post("/calculate_skill_results")
 def calculate_skill_results(body: AnswersRequest) -> CalculateResultsData:
     """Calculate skill assessment results based on answers"""
-    questions = parse_skill_questions()
-    question_map = {q['id']: q for q in questions}
+    question_map, _ = _skill_questions()
     
     results = []
     for answer in body.answers:
@@ -114,9 +149,9 @@ def calculate_skill_results(body: AnswersRequest) -> CalculateResultsData:
         results.append(SkillResult(
             questionId=answer.questionId,
             score=answer.rating,
-            name=question['name'],
-            category=question['category'],
-            description=question['description']
+            name=question.name,
+            category=question.category,
+            description=question.description
         ))
     
     return CalculateResultsData(results=results)
@@ -2,15 +2,43 @@
 
 
 # Re-saving to trigger reload
+import asyncio
+import time
+from collections import OrderedDict
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from app.services.firebase import FirebaseInitializationError, get_assessments_collection
 
 
 router = APIRouter()
 
+# Short-lived cache of assessment documents found in Firestore so report
+# workflows polling the same user do not hit Firestore on every call.
+# Bounded and evicted least recently used first, since the user id comes
+# from the request path
+ASSESSMENTS_CACHE_TTL = 60.0
+ASSESSMENTS_CACHE_MAXSIZE = 1024
+_assessments_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# Fixed pool of locks striped by user id; the pool does not grow with the
+# ids clients ask for
+ASSESSMENTS_LOCK_STRIPES = 64
+_assessments_locks = [asyncio.Lock() for _ in range(ASSESSMENTS_LOCK_STRIPES)]
+
+# Only these fields of the assessment document are returned, so only these
+# are fetched
+ASSESSMENT_FIELDS = [
+    'interest',
+    'ability',
+    'knowledge',
+    'skills',
+    'career_recommendations',
+    'careerRecommendations',
+]
+
 class UserAssessments(BaseModel):
     interest: Optional[Dict[str, Any]] = Field(None, description="Interest assessment results")
     ability: Optional[Dict[str, Any]] = Field(None, description="Ability assessment results")
@@ -19,6 +47,39 @@ class UserAssessments(BaseModel):
     career_recommendations: Optional[Dict[str, Any]] = Field(None, description="Career recommendations")
 
 
+async def _load_user_assessments(user_id: str) -> Dict[str, Any]:
+    """Return the user's assessment document, served from cache when fresh"""
+    hit = _assessments_cache.get(user_id)
+    if hit is not None:
+        if time.monotonic() - hit[0] < ASSESSMENTS_CACHE_TTL:
+            _assessments_cache.move_to_end(user_id)
+            return hit[1]
+        del _assessments_cache[user_id]
+
+    try:
+        assessments_ref = get_assessments_collection().document(user_id)
+    except FirebaseInitializationError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    # The Firestore client is synchronous; keep the event loop free
+    doc = await asyncio.to_thread(assessments_ref.get, field_paths=ASSESSMENT_FIELDS)
+
+    if not doc.exists:
+        raise HTTPException(status_code=404, detail="User assessments not found")
+
+    # Only documents that exist are cached
+    data = doc.to_dict()
+    _assessments_cache[user_id] = (time.monotonic(), data)
+    while len(_assessments_cache) > ASSESSMENTS_CACHE_MAXSIZE:
+        _assessments_cache.popitem(last=False)
+    return data
+
+
+def _assessments_lock(user_id: str) -> asyncio.Lock:
+    """The lock stripe serializing Firestore reads for `user_id`"""
+    return _assessments_locks[hash(user_id) % ASSESSMENTS_LOCK_STRIPES]
+
+
 @router.get("/user-assessments/{user_id}", response_model=UserAssessments)
 async def get_user_assessments(user_id: str):
     """
@@ -27,17 +88,9 @@ async def get_user_assessments(user_id: str):
     The aggregated data is used by the AI-powered report generation endpoints.
     """
     try:
-        assessments_ref = get_assessments_collection().document(user_id)
-    except FirebaseInitializationError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
-
-    try:
-        doc = assessments_ref.get()
-
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail="User assessments not found")
-
-        data = doc.to_dict()
+        # Concurrent requests for the same user share a single Firestore read
+        async with _assessments_lock(user_id):
+            data = await _load_user_assessments(user_id)
 
         return UserAssessments(
             interest=data.get('interest'),
@@ -0,0 +1,249 @@
+"""Vectorized Pearson correlation of one profile against many occupations."""
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+# Occupation tables taller than this are scanned with the numba kernel when
+# numba is installed; BLAS dispatch wins on anything smaller
+NUMBA_MIN_OCCUPATIONS = 2000
+
+# Tables at most this many columns wide are scored faster by the compiled
+# narrow_vector_pearson loop than by a BLAS GEMV plus its NumPy passes
+NARROW_MAX_ITEMS = 8
+
+
+def row_moments(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row sum and sum of squares, read-only so they can be cached"""
+    # Accumulate in float64 so the variance subtraction stays exact enough
+    row_sums = matrix.sum(axis=1, dtype=np.float64)
+    row_sq_sums = np.einsum("ij,ij->i", matrix, matrix, dtype=np.float64)
+    for array in (row_sums, row_sq_sums):
+        array.flags.writeable = False
+    return row_sums, row_sq_sums
+
+
+if njit is not None:
+    # Every flag except nnan/ninf, so rows with missing ratings still drop out
+    @njit(parallel=True, cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+    def _fused_row_stats(matrix, user_centered):
+        """Row sums, sums of squares and centered dot products in one pass"""
+        n_rows, n_items = matrix.shape
+        row_sums = np.empty(n_rows)
+        row_sq_sums = np.empty(n_rows)
+        sum_product = np.empty(n_rows)
+        for i in prange(n_rows):
+            total = 0.0
+            squares = 0.0
+            dot = 0.0
+            for j in range(n_items):
+                value = matrix[i, j]
+                total += value
+                squares += value * value
+                dot += value * user_centered[j]
+            row_sums[i] = total
+            row_sq_sums[i] = squares
+            sum_product[i] = dot
+        return row_sums, row_sq_sums, sum_product
+
+    @njit(parallel=True, cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+    def _masked_row_pearson(matrix, user_values):
+        """Welford-style running co-moments per row, skipping missing values"""
+        n_rows, n_items = matrix.shape
+        correlations = np.empty(n_rows)
+        counts = np.zeros(n_rows, dtype=np.int64)
+        for i in prange(n_rows):
+            count = 0
+            occ_mean = 0.0
+            user_mean = 0.0
+            occ_ss = 0.0
+            user_ss = 0.0
+            cross = 0.0
+            for j in range(n_items):
+                value = matrix[i, j]
+                if np.isnan(value):
+                    continue
+                count += 1
+                occ_delta = value - occ_mean
+                user_delta = user_values[j] - user_mean
+                occ_mean += occ_delta / count
+                user_mean += user_delta / count
+                occ_ss += occ_delta * (value - occ_mean)
+                user_ss += user_delta * (user_values[j] - user_mean)
+                cross += occ_delta * (user_values[j] - user_mean)
+            counts[i] = count
+            if count > 1 and occ_ss > 0.0 and user_ss > 0.0:
+                correlations[i] = cross / np.sqrt(occ_ss * user_ss)
+            else:
+                correlations[i] = np.nan
+        return correlations, counts
+
+    @njit(cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+    def _narrow_row_pearson(matrix, user_centered, user_ss):
+        """Two-pass Pearson per row for tables only a few columns wide"""
+        n_rows, n_items = matrix.shape
+        correlations = np.empty(n_rows)
+        for i in range(n_rows):
+            total = 0.0
+            for j in range(n_items):
+                total += matrix[i, j]
+            mean = total / n_items
+            squares = 0.0
+            occ_ss = 0.0
+            dot = 0.0
+            for j in range(n_items):
+                value = matrix[i, j]
+                deviation = value - mean
+                squares += value * value
+                occ_ss += deviation * deviation
+                dot += deviation * user_centered[j]
+            # Same clamp as vector_pearson for rounding noise on flat rows
+            if occ_ss > 1e-12 * squares and user_ss > 0.0:
+                correlations[i] = dot / np.sqrt(occ_ss * user_ss)
+            else:
+                correlations[i] = np.nan
+        return correlations
+else:
+    _fused_row_stats = None
+    _masked_row_pearson = None
+    _narrow_row_pearson = None
+
+
+def vector_pearson(
+    user_values: np.ndarray,
+    matrix: np.ndarray,
+    moments: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """Pearson r between `user_values` and every row of `matrix`.
+
+    `matrix` columns must follow the order of `user_values`. `moments` are
+    the row_moments of that exact matrix, when already cached. Rows without
+    variance, rows with missing values and a flat user profile give NaN.
+    """
+    n_items = len(user_values)
+    user_values = np.asarray(user_values, dtype=np.float64)
+    user_centered = user_values - user_values.mean()
+    user_ss = user_centered @ user_centered
+
+    sum_product = None
+    if moments is None:
+        if _fused_row_stats is not None and len(matrix) > NUMBA_MIN_OCCUPATIONS:
+            *moments, sum_product = _fused_row_stats(np.ascontiguousarray(matrix), user_centered)
+        else:
+            moments = row_moments(matrix)
+    row_sums, row_sq_sums = moments
+
+    # Sum of products of deviations; centering the user vector alone is
+    # enough because its deviations sum to zero
+    if sum_product is None:
+        sum_product = matrix @ user_centered.astype(matrix.dtype)
+
+    # Row sums of squared deviations from the moments; clamp the rounding
+    # noise that constant rows leave behind
+    occ_ss = row_sq_sums - row_sums * row_sums / n_items
+    occ_ss[occ_ss <= 1e-12 * row_sq_sums] = 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlations = sum_product / np.sqrt(occ_ss * user_ss)
+    correlations[~(occ_ss > 0)] = np.nan
+    if not user_ss > 0:
+        correlations[:] = np.nan
+
+    return correlations
+
+
+def narrow_vector_pearson(
+    user_values: np.ndarray,
+    matrix: np.ndarray,
+    moments: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """vector_pearson for fixed, narrow tables such as the six RIASEC types.
+
+    With numba each row is scored in a single compiled loop, which beats
+    the handful of NumPy passes vector_pearson makes over such a small
+    matrix; otherwise this is vector_pearson with the cached `moments`.
+    """
+    if _narrow_row_pearson is None:
+        return vector_pearson(user_values, matrix, moments)
+
+    user_values = np.asarray(user_values, dtype=np.float64)
+    user_centered = user_values - user_values.mean()
+    return _narrow_row_pearson(
+        np.ascontiguousarray(matrix), user_centered, user_centered @ user_centered
+    )
+
+
+def masked_vector_pearson(
+    user_values: np.ndarray,
+    matrix: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pearson r per row over only the columns that row has values for.
+
+    Returns the correlations and the per-row count of non-missing columns.
+    Rows with fewer than two values or no variance give NaN.
+    """
+    user_values = np.asarray(user_values, dtype=np.float64)
+    if _masked_row_pearson is not None:
+        # One pass per row instead of five masked temporaries
+        return _masked_row_pearson(np.ascontiguousarray(matrix), user_values)
+
+    valid = ~np.isnan(matrix)
+    filled = np.where(valid, matrix, 0.0)
+    weights = valid.astype(np.float64)
+
+    counts = valid.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        occ_sums = filled.sum(axis=1)
+        occ_sq_sums = np.einsum("ij,ij->i", filled, filled)
+        user_sums = weights @ user_values
+        user_sq_sums = weights @ (user_values * user_values)
+
+        cross = filled @ user_values - occ_sums * user_sums / counts
+        occ_ss = occ_sq_sums - occ_sums * occ_sums / counts
+        user_ss = user_sq_sums - user_sums * user_sums / counts
+
+        # Clamp the rounding noise that constant rows leave behind
+        occ_ss[occ_ss <= 1e-12 * occ_sq_sums] = 0.0
+        user_ss[user_ss <= 1e-12 * user_sq_sums] = 0.0
+
+        correlations = cross / np.sqrt(occ_ss * user_ss)
+    correlations[~((occ_ss > 0) & (user_ss > 0) & (counts > 1))] = np.nan
+
+    return correlations, counts
+
+
+def batch_vector_pearson(
+    user_matrix: np.ndarray,
+    matrix: np.ndarray,
+    moments: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """Pearson r between every user row and every row of `matrix`.
+
+    `user_matrix` is users x items with columns in the order of `matrix`.
+    Returns an occupations x users array from a single GEMM; entries follow
+    the same NaN rules as vector_pearson.
+    """
+    n_items = matrix.shape[1]
+    user_matrix = np.asarray(user_matrix, dtype=np.float64)
+    users_centered = user_matrix - user_matrix.mean(axis=1, keepdims=True)
+    users_ss = np.einsum("ij,ij->i", users_centered, users_centered)
+
+    if moments is None:
+        moments = row_moments(matrix)
+    row_sums, row_sq_sums = moments
+
+    sum_product = matrix @ users_centered.T.astype(matrix.dtype)
+
+    occ_ss = row_sq_sums - row_sums * row_sums / n_items
+    occ_ss[occ_ss <= 1e-12 * row_sq_sums] = 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlations = sum_product / np.sqrt(np.outer(occ_ss, users_ss))
+    correlations[~(occ_ss > 0), :] = np.nan
+    correlations[:, ~(users_ss > 0)] = np.nan
+
+    return correlations
@@ -0,0 +1,10 @@
+"""Shared response classes for the API routers."""
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Default response class for routers returning large JSON payloads
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
@@ -0,0 +1,217 @@
+"""Importance-weighted fit and cosine of a user's levels against occupation
+requirements."""
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional accelerator
+    njit = None
+
+
+def _element_fit(user_level: float, required_level: float, damping: float) -> float:
+    """Fit of one element: squared shortfall below the requirement, a
+    damped penalty for overqualification above it, clamped to [0, 1]"""
+    if required_level <= 0:
+        fit = 1.0
+    elif user_level < required_level:
+        fit = (user_level / required_level) ** 2
+    else:
+        overage = (user_level - required_level) / 100.0
+        fit = 1.0 - (1.0 - required_level / 100.0) * overage * damping
+    return max(0.0, min(fit, 1.0))
+
+
+def _python_weighted_fit(user, required, importance, damping):
+    weighted_score = 0.0
+    total_weight = 0.0
+    for user_level, required_level, weight in zip(user, required, importance):
+        if weight <= 0:
+            continue
+        weighted_score += _element_fit(user_level, required_level, damping) * weight
+        total_weight += weight
+
+    if total_weight == 0:
+        return 0.0, 0.0
+    return weighted_score / total_weight, total_weight
+
+
+def _numpy_weighted_fit_rows(user, required, importance, present, damping):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = user / required
+        overage = (user - required) / 100.0
+        fit = np.where(
+            required <= 0,
+            1.0,
+            np.where(
+                user < required,
+                ratio ** 2,
+                1.0 - (1.0 - required / 100.0) * overage * damping
+            )
+        )
+    fit = np.clip(fit, 0.0, 1.0)
+
+    weights = np.where(present & (importance > 0), importance, 0.0)
+    total_weight = weights.sum(axis=1)
+    weighted_score = np.where(weights > 0, fit * weights, 0.0).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fit_score = np.where(total_weight == 0, 0.0, weighted_score / total_weight)
+    return fit_score, total_weight
+
+
+def _numpy_weighted_cosine_rows(user, required, importance, present):
+    importance = importance / 100.0
+    weighted_user = np.where(present, user * importance, 0.0)
+    weighted_required = np.where(present, required * importance, 0.0)
+
+    numerator = np.einsum("ij,ij->i", weighted_user, weighted_required)
+    denominator = (
+        np.sqrt(np.einsum("ij,ij->i", weighted_user, weighted_user))
+        * np.sqrt(np.einsum("ij,ij->i", weighted_required, weighted_required))
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.clip(numerator / denominator, -1.0, 1.0)
+    return np.where(denominator == 0, 0.0, (cosine + 1.0) / 2.0)
+
+
+if njit is not None:
+    _compiled_element_fit = njit(cache=True)(_element_fit)
+
+    @njit(cache=True)
+    def _fit_kernel(user, required, importance, damping):
+        """_python_weighted_fit over contiguous float64 arrays"""
+        weighted_score = 0.0
+        total_weight = 0.0
+        for j in range(user.shape[0]):
+            weight = importance[j]
+            if weight <= 0:
+                continue
+            weighted_score += _compiled_element_fit(user[j], required[j], damping) * weight
+            total_weight += weight
+
+        if total_weight == 0:
+            return 0.0, 0.0
+        return weighted_score / total_weight, total_weight
+
+    # nogil so concurrent requests on the server's worker threads overlap
+    @njit(parallel=True, nogil=True, cache=True)
+    def _fit_rows_kernel(user, required, importance, present, damping):
+        """_fit_kernel for every occupation row, skipping absent elements"""
+        n_rows, n_items = required.shape
+        fit_score = np.zeros(n_rows)
+        total_weight = np.zeros(n_rows)
+        for i in prange(n_rows):
+            weighted = 0.0
+            total = 0.0
+            for j in range(n_items):
+                weight = importance[i, j]
+                if not present[i, j] or not weight > 0:
+                    continue
+                weighted += _compiled_element_fit(user[j], required[i, j], damping) * weight
+                total += weight
+            total_weight[i] = total
+            if total != 0:
+                fit_score[i] = weighted / total
+        return fit_score, total_weight
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def _cosine_rows_kernel(user, required, importance, present):
+        """Rescaled importance-weighted cosine per occupation row, in one
+        pass over its present elements"""
+        n_rows, n_items = required.shape
+        scores = np.zeros(n_rows)
+        for i in prange(n_rows):
+            dot = 0.0
+            user_sq = 0.0
+            required_sq = 0.0
+            for j in range(n_items):
+                if not present[i, j]:
+                    continue
+                weight = importance[i, j] / 100.0
+                weighted_user = user[j] * weight
+                weighted_required = required[i, j] * weight
+                dot += weighted_user * weighted_required
+                user_sq += weighted_user * weighted_user
+                required_sq += weighted_required * weighted_required
+            denominator = np.sqrt(user_sq) * np.sqrt(required_sq)
+            if denominator != 0:
+                cosine = max(-1.0, min(dot / denominator, 1.0))
+                scores[i] = (cosine + 1.0) / 2.0
+        return scores
+else:
+    _fit_kernel = None
+    _fit_rows_kernel = None
+    _cosine_rows_kernel = None
+
+
+def weighted_fit(
+    user: np.ndarray,
+    required: np.ndarray,
+    importance: np.ndarray,
+    damping: float,
+) -> Tuple[float, float]:
+    """Importance-weighted mean fit over elements with positive importance.
+
+    Returns the fit and the total importance; both are 0.0 when no
+    element carries weight.
+    """
+    if _fit_kernel is None:
+        return _python_weighted_fit(user, required, importance, damping)
+
+    score, total = _fit_kernel(
+        np.ascontiguousarray(user, dtype=np.float64),
+        np.ascontiguousarray(required, dtype=np.float64),
+        np.ascontiguousarray(importance, dtype=np.float64),
+        damping,
+    )
+    return float(score), float(total)
+
+
+def weighted_fit_rows(
+    user: np.ndarray,
+    required: np.ndarray,
+    importance: np.ndarray,
+    present: np.ndarray,
+    damping: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """weighted_fit of one user against every occupation row.
+
+    `required` and `importance` are occupations x elements, float32 or
+    float64 (sums are always taken in float64); `present` marks the
+    elements each occupation is scored on.
+    """
+    if _fit_rows_kernel is None:
+        return _numpy_weighted_fit_rows(user, required, importance, present, damping)
+
+    return _fit_rows_kernel(
+        np.ascontiguousarray(user, dtype=np.float64),
+        np.ascontiguousarray(required),
+        np.ascontiguousarray(importance),
+        np.ascontiguousarray(present),
+        damping,
+    )
+
+
+def weighted_cosine_rows(
+    user: np.ndarray,
+    required: np.ndarray,
+    importance: np.ndarray,
+    present: np.ndarray,
+) -> np.ndarray:
+    """Importance-weighted cosine of the user against every occupation row,
+    rescaled from [-1, 1] to [0, 1]; 0.0 where either side has no weight.
+
+    Arguments are laid out as for weighted_fit_rows.
+    """
+    if _cosine_rows_kernel is None:
+        return _numpy_weighted_cosine_rows(user, required, importance, present)
+
+    return _cosine_rows_kernel(
+        np.ascontiguousarray(user, dtype=np.float64),
+        np.ascontiguousarray(required),
+        np.ascontiguousarray(importance),
+        np.ascontiguousarray(present),
+    )
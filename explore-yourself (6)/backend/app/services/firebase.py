@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from functools import lru_cache
 from typing import Optional
 
@@ -33,18 +34,24 @@ def _load_service_account() -> dict:
         raise FirebaseInitializationError("Invalid Firebase service account JSON") from exc
 
 
+_client_lock = threading.Lock()
+
+
 @lru_cache(maxsize=1)
 def get_firestore_client() -> firestore.Client:
     """Initialise (once) and return a Firestore client."""
-    if not firebase_admin._apps:
-        credentials_dict = _load_service_account()
-        cred = credentials.Certificate(credentials_dict)
-        firebase_admin.initialize_app(cred)
+    # Requests now reach Firestore from worker threads; lru_cache alone lets
+    # concurrent first calls race into initialize_app
+    with _client_lock:
+        if not firebase_admin._apps:
+            credentials_dict = _load_service_account()
+            cred = credentials.Certificate(credentials_dict)
+            firebase_admin.initialize_app(cred)
 
-    try:
-        return firestore.client()
-    except Exception as exc:  # pragma: no cover - firestore client errors surfaced to caller
-        raise FirebaseInitializationError("Unable to obtain Firestore client") from exc
+        try:
+            return firestore.client()
+        except Exception as exc:  # pragma: no cover - firestore client errors surfaced to caller
+            raise FirebaseInitializationError("Unable to obtain Firestore client") from exc
 
 
 def get_assessments_collection() -> firestore.CollectionReference:
@@ -0,0 +1,135 @@
+from pathlib import Path
+import sys
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+databutton_stub = types.ModuleType("databutton")
+databutton_stub.secrets = SimpleNamespace(get=lambda _key: "{}")
+sys.modules.setdefault("databutton", databutton_stub)
+
+from app.apis.analyze_results import (  # noqa: E402
+    _calculate_correlations,
+    _compute_row_moments,
+    _importance_arrays_pandas,
+)
+
+
+def _reference_correlations(user_profile: pd.Series, occupation_data: pd.DataFrame) -> dict:
+    results = {}
+    n_items = len(user_profile)
+    for occupation, row in occupation_data.iterrows():
+        if user_profile.std() == 0 or row.std() == 0:
+            continue
+        sum_product = sum((user_profile - user_profile.mean()) * (row - row.mean()))
+        correlation = sum_product / (n_items * user_profile.std() * row.std())
+        if correlation > 0:
+            results[occupation] = float(correlation)
+    return results
+
+
+def _occupation_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    data = rng.uniform(1.0, 5.0, size=(40, 6))
+    data[3] = 2.5  # constant profile is skipped
+    return pd.DataFrame(
+        data,
+        index=[f"Occupation {i}" for i in range(40)],
+        columns=[f"Element {j}" for j in range(6)],
+    )
+
+
+def test_calculate_correlations_matches_row_by_row_reference() -> None:
+    occupations = _occupation_frame()
+    user_profile = pd.Series([4.0, 1.5, 3.0, 2.0, 5.0, 3.5], index=occupations.columns)
+
+    expected = _reference_correlations(user_profile, occupations)
+    matches = _calculate_correlations(
+        user_profile.to_numpy(),
+        occupations.to_numpy(),
+        occupations.index.to_numpy(),
+        limit=len(occupations),
+    )
+
+    assert [m.title for m in matches] == sorted(expected, key=expected.get, reverse=True)
+    for match in matches:
+        assert np.isclose(match.correlation, expected[match.title])
+
+
+def test_calculate_correlations_limits_results_to_top_matches() -> None:
+    occupations = _occupation_frame()
+    user_profile = pd.Series([4.0, 1.5, 3.0, 2.0, 5.0, 3.5], index=occupations.columns)
+
+    args = (user_profile.to_numpy(), occupations.to_numpy(), occupations.index.to_numpy())
+
+    top = _calculate_correlations(*args, limit=5)
+    everything = _calculate_correlations(*args, limit=len(occupations))
+
+    assert [m.title for m in top] == [m.title for m in everything[:5]]
+
+
+def test_calculate_correlations_accepts_precomputed_row_moments() -> None:
+    occupations = _occupation_frame()
+    user_profile = pd.Series([4.0, 1.5, 3.0, 2.0, 5.0, 3.5], index=occupations.columns)
+    matrix = occupations.to_numpy()
+    args = (user_profile.to_numpy(), matrix, occupations.index.to_numpy())
+
+    cached = _calculate_correlations(*args, _compute_row_moments(matrix))
+    computed = _calculate_correlations(*args)
+
+    assert [(m.title, m.correlation) for m in cached] == [(m.title, m.correlation) for m in computed]
+
+
+def test_calculate_correlations_returns_nothing_for_flat_user_profile() -> None:
+    occupations = _occupation_frame()
+    user_profile = pd.Series(3.0, index=occupations.columns)
+
+    matches = _calculate_correlations(
+        user_profile.to_numpy(), occupations.to_numpy(), occupations.index.to_numpy()
+    )
+
+    assert matches == []
+
+
+def _arrow_importance_arrays(df: pd.DataFrame):
+    pytest.importorskip("pyarrow")
+    from app.apis.analyze_results import _importance_arrays_arrow
+
+    return _importance_arrays_arrow(df)
+
+
+@pytest.mark.parametrize("build", [_importance_arrays_pandas, _arrow_importance_arrays])
+def test_importance_arrays_average_importance_ratings(build) -> None:
+    frame = _occupation_frame()
+    long = frame.stack().rename("Data Value").reset_index()
+    long.columns = ["Title", "Element Name", "Data Value"]
+    long["Scale Name"] = "Importance"
+    level = long.assign(**{"Scale Name": "Level", "Data Value": 0.0})
+    duplicate = long.iloc[[0]].assign(**{"Data Value": 1.0})
+    null_keys = pd.DataFrame(
+        {
+            "Title": [None, "Occupation 1"],
+            "Element Name": ["Element 0", None],
+            "Data Value": [5.0, 5.0],
+            "Scale Name": ["Importance", "Importance"],
+        }
+    )
+    df = pd.concat(
+        [level, long.iloc[1:].sample(frac=1, random_state=0), duplicate, long.iloc[[0]], null_keys],
+        ignore_index=True,
+    )
+    df = df[~((df["Title"] == "Occupation 9") & (df["Element Name"] == "Element 2"))]
+
+    expected = frame.sort_index().sort_index(axis=1)
+    expected.iloc[0, 0] = (frame.iloc[0, 0] + 1.0) / 2
+    expected.loc["Occupation 9", "Element 2"] = np.nan
+    matrix, titles, element_names = build(df)
+
+    assert list(titles) == list(expected.index)
+    assert list(element_names) == list(expected.columns)
+    assert np.allclose(matrix, expected.to_numpy(dtype=np.float32), equal_nan=True)
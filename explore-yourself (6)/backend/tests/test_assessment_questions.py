@@ -0,0 +1,76 @@
+from pathlib import Path
+import json
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+databutton_stub = types.ModuleType("databutton")
+databutton_stub.secrets = SimpleNamespace(get=lambda _key: "{}")
+sys.modules.setdefault("databutton", databutton_stub)
+
+import app.apis.knowledge_assessment_api as knowledge_assessment_api  # noqa: E402
+import app.apis.skills_assessment_api as skills_assessment_api  # noqa: E402
+
+QUESTION_TEXT = """
+Element Name: Mathematics
+Description: Using mathematics to solve problems.
+Level Examples:
+Level 2: Count the change
+Level 6: Derive a formula
+"""
+
+APIS = [
+    (skills_assessment_api, "skill", "skills-cleaned-1-txt"),
+    (knowledge_assessment_api, "knowledge", "knowledge-cleaned-1-txt"),
+]
+
+
+@pytest.fixture(params=APIS, ids=["skills", "knowledge"])
+def question_api(request, monkeypatch):
+    """Assessment module reading from in-memory text; returns the keys read"""
+    module, kind, key = request.param
+    texts = {key: ""}
+    reads = []
+
+    def get(name):
+        reads.append(name)
+        return texts[name]
+
+    monkeypatch.setattr(module, "db", SimpleNamespace(storage=SimpleNamespace(text=SimpleNamespace(get=get))))
+    clear = getattr(module, f"clear_{kind}_question_cache")
+    clear()
+    yield module, kind, key, texts, reads
+    clear()
+
+
+def test_empty_question_reads_are_not_cached(question_api) -> None:
+    module, kind, key, texts, reads = question_api
+    get_questions = getattr(module, f"get_{kind}_questions")
+
+    assert json.loads(get_questions().body) == []
+    texts[key] = QUESTION_TEXT
+    first = json.loads(get_questions().body)
+    second = json.loads(get_questions().body)
+
+    assert reads == [key, key]
+    assert first == second
+    assert [(q["id"], q["name"], q["levels"]) for q in first] == [(1, "Mathematics", [2, 6])]
+
+
+def test_cached_questions_are_read_only_until_cleared(question_api) -> None:
+    module, kind, key, texts, reads = question_api
+    texts[key] = QUESTION_TEXT
+    question_map, _ = getattr(module, f"_{kind}_questions")()
+
+    with pytest.raises(TypeError):
+        question_map[2] = question_map[1]
+    with pytest.raises(ValueError):
+        question_map[1].name = "Changed"
+
+    getattr(module, f"clear_{kind}_question_cache")()
+    getattr(module, f"_{kind}_questions")()
+    assert reads == [key, key]
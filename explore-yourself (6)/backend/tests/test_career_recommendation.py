@@ -0,0 +1,485 @@
+from pathlib import Path
+import sys
+import threading
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import pearsonr
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+databutton_stub = types.ModuleType("databutton")
+databutton_stub.secrets = SimpleNamespace(get=lambda _key: "{}")
+sys.modules.setdefault("databutton", databutton_stub)
+
+import app.apis.career_recommendation as career_recommendation  # noqa: E402
+from app.apis.career_recommendation import (  # noqa: E402
+    RIASEC_ORDER,
+    InterestScore,
+    SkillScore,
+    _critical_rule_index,
+    _top_scores,
+    calculate_element_correlations_all,
+    calculate_element_correlations_batch,
+    calculate_interest_correlations_all,
+    occupation_matches_keywords,
+)
+
+
+def _interests_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    rows = []
+    for i in range(25):
+        values = rng.uniform(1.0, 7.0, size=len(RIASEC_ORDER))
+        if i == 4:
+            values[:] = 3.0  # flat profile has no correlation
+        for category, value in zip(RIASEC_ORDER, values):
+            rows.append({"Title": f"Occupation {i}", "Element Name": category, "Data Value": value})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def interests_storage(monkeypatch):
+    frames = {"elements-interests-csv": _interests_frame()}
+    storage = SimpleNamespace(dataframes=SimpleNamespace(get=frames.__getitem__))
+    monkeypatch.setattr(career_recommendation, "db", SimpleNamespace(storage=storage))
+    career_recommendation._clear_onet_caches()
+    yield frames["elements-interests-csv"]
+    career_recommendation._clear_onet_caches()
+
+
+def test_interest_correlations_match_pearsonr(interests_storage) -> None:
+    ratings = {"Realistic": 2.0, "Investigative": 5.0, "Artistic": 1.0, "Social": 4.0}
+    user = [InterestScore(name=name, rating=rating) for name, rating in ratings.items()]
+
+    scores, overlaps, matched = calculate_interest_correlations_all(user)
+
+    profiles = interests_storage.pivot(index="Title", columns="Element Name", values="Data Value")
+    expected = {}
+    for title, row in profiles.iterrows():
+        occupation = row[list(ratings)]
+        if occupation.std() > 0:
+            r, _ = pearsonr(list(ratings.values()), occupation)
+            expected[title] = (r + 1) / 2
+
+    assert set(scores) == set(expected)
+    assert "Occupation 4" not in scores
+    for title, score in expected.items():
+        assert np.isclose(scores[title], score)
+        assert overlaps[title] == len(ratings)
+        assert matched[title] == list(ratings)
+
+
+def test_interest_correlations_require_minimum_overlap(interests_storage) -> None:
+    user = [InterestScore(name="Realistic", rating=3.0), InterestScore(name="Social", rating=5.0)]
+
+    assert calculate_interest_correlations_all(user) == ({}, {}, {})
+
+
+def test_top_scores_matches_full_sort_with_ties() -> None:
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 10, size=200) / 10  # plenty of ties
+    scores = {f"Occupation {i}": float(v) for i, v in enumerate(values)}
+
+    expected = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+    assert _top_scores(scores) == expected[:20]
+    assert _top_scores(scores, limit=500) == expected
+
+
+def test_scale_rows_are_empty_for_missing_scales(monkeypatch) -> None:
+    columns = ["Title", "Element Name", "Scale Name", "Data Value"]
+    frames = {
+        "importance-only": pd.DataFrame([["Occupation 0", "Skill 0", "Importance", 3.0]], columns=columns),
+        "empty": pd.DataFrame(columns=columns),
+    }
+    storage = SimpleNamespace(dataframes=SimpleNamespace(get=frames.__getitem__))
+    monkeypatch.setattr(career_recommendation, "db", SimpleNamespace(storage=storage))
+    career_recommendation._clear_onet_caches()
+
+    try:
+        for name in frames:
+            rows = career_recommendation._scale_rows(name, "Level")
+            assert rows.empty
+            assert list(rows.columns) == ["Title", "Element Name", "Data Value"]
+    finally:
+        career_recommendation._clear_onet_caches()
+
+
+def test_element_correlations_score_incomplete_occupations_on_present_elements(monkeypatch) -> None:
+    rng = np.random.default_rng(2)
+    elements = [f"Skill {j}" for j in range(6)]
+    rows = [
+        {"Title": f"Occupation {i}", "Element Name": element, "Scale Name": "Level",
+         "Data Value": float(rng.uniform(0.0, 7.0))}
+        for i in range(12)
+        for element in elements
+        if not (i == 5 and element == "Skill 1")
+    ]
+    frames = {"elements-skills-csv": pd.DataFrame(rows)}
+    storage = SimpleNamespace(dataframes=SimpleNamespace(get=frames.__getitem__))
+    monkeypatch.setattr(career_recommendation, "db", SimpleNamespace(storage=storage))
+    career_recommendation._clear_onet_caches()
+
+    try:
+        user = [SkillScore(name=element, rating=float(j % 4)) for j, element in enumerate(elements)]
+        scores, overlaps, matched = calculate_element_correlations_all(
+            user, "elements-skills-csv", "skills"
+        )
+    finally:
+        career_recommendation._clear_onet_caches()
+
+    assert len(scores) == 12
+    assert overlaps["Occupation 5"] == 5
+    assert "Skill 1" not in matched["Occupation 5"]
+    assert overlaps["Occupation 0"] == 6
+
+    # Min-max scaled per element over the ratings present, then correlated
+    # over the elements each occupation has
+    pivot = pd.DataFrame(rows).pivot(index="Title", columns="Element Name", values="Data Value")
+    low, high = pivot.min(), pivot.max()
+    normalized = (pivot - low) / (high - low)
+    profile = ((pd.Series({item.name: item.rating for item in user}) - low) / (high - low)).clip(0, 1)
+    for title, row in normalized.iterrows():
+        present = row.notna()
+        expected = (pearsonr(profile[present], row[present])[0] + 1) / 2
+        assert np.isclose(scores[title], expected, rtol=0.0, atol=1e-6), title
+
+
+def test_critical_rule_keyword_pattern_matches_substring_check() -> None:
+    rules = [{"element": "Finger Dexterity", "occupations": [], "keywords": ["Surgeon", "data scientist"]}]
+    ((_rule, _occupations, pattern),) = _critical_rule_index(rules)
+
+    for title in ["Orthopedic Surgeons", "Data Scientists", "Neurosurgeon", "Dentists", "Database Administrators"]:
+        assert (pattern.search(title) is not None) == occupation_matches_keywords(title, rules[0]["keywords"])
+
+
+def test_element_correlations_batch_matches_single_user_calls(monkeypatch) -> None:
+    rng = np.random.default_rng(4)
+    elements = [f"Skill {j}" for j in range(6)]
+    rows = [
+        {"Title": f"Occupation {i}", "Element Name": element, "Scale Name": "Level",
+         "Data Value": float(rng.uniform(0.0, 7.0))}
+        for i in range(15)
+        for element in elements
+    ]
+    frames = {"elements-skills-csv": pd.DataFrame(rows)}
+    storage = SimpleNamespace(dataframes=SimpleNamespace(get=frames.__getitem__))
+    monkeypatch.setattr(career_recommendation, "db", SimpleNamespace(storage=storage))
+    career_recommendation._clear_onet_caches()
+
+    users = [
+        [SkillScore(name=element, rating=float(rng.uniform(0.0, 7.0))) for element in elements],
+        [SkillScore(name=element, rating=float(rng.uniform(0.0, 7.0))) for element in elements[:4]],
+        [SkillScore(name=element, rating=float(rng.uniform(0.0, 7.0))) for element in elements],
+        [SkillScore(name=elements[0], rating=3.0)],  # below the minimum overlap
+    ]
+    try:
+        batched = calculate_element_correlations_batch(users, "elements-skills-csv", "skills")
+        single = [
+            calculate_element_correlations_all(user, "elements-skills-csv", "skills")
+            for user in users
+        ]
+    finally:
+        career_recommendation._clear_onet_caches()
+
+    assert batched[3] == ({}, {}, {})
+    for (scores, overlaps, matched), (expected_scores, expected_overlaps, expected_matched) in zip(batched, single):
+        assert list(scores) == list(expected_scores)
+        assert np.allclose(list(scores.values()), list(expected_scores.values()))
+        assert overlaps == expected_overlaps
+        assert {k: sorted(v) for k, v in matched.items()} == {k: sorted(v) for k, v in expected_matched.items()}
+
+
+def test_element_correlations_for_every_element_use_cached_row_moments(monkeypatch) -> None:
+    rng = np.random.default_rng(6)
+    elements = [f"Skill {j}" for j in range(8)]
+    rows = [
+        {"Title": f"Occupation {i}", "Element Name": element, "Scale Name": "Level",
+         "Data Value": float(rng.uniform(0.0, 7.0))}
+        for i in range(15)
+        for element in elements
+    ]
+    frames = {"elements-skills-csv": pd.DataFrame(rows)}
+    storage = SimpleNamespace(dataframes=SimpleNamespace(get=frames.__getitem__))
+    monkeypatch.setattr(career_recommendation, "db", SimpleNamespace(storage=storage))
+    career_recommendation._clear_onet_caches()
+
+    # Rated in an order unlike the matrix columns
+    user = [SkillScore(name=element, rating=float(rng.uniform(0.0, 7.0))) for element in elements[::-1]]
+    try:
+        cached = calculate_element_correlations_all(user, "elements-skills-csv", "skills")
+        (batched,) = calculate_element_correlations_batch([user], "elements-skills-csv", "skills")
+        with monkeypatch.context() as patch:
+            patch.setattr(career_recommendation, "_normalized_row_moments", lambda *args: None)
+            sliced = calculate_element_correlations_all(user, "elements-skills-csv", "skills")
+    finally:
+        career_recommendation._clear_onet_caches()
+
+    for result in (cached, batched):
+        scores, overlaps, matched = result
+        assert list(scores) == list(sliced[0])
+        assert np.allclose(list(scores.values()), list(sliced[0].values()), atol=1e-6)
+        assert overlaps == sliced[1]
+        assert matched == sliced[2]
+
+
+def _reference_weighted_matches(user, level_matrix, importance_matrix, element_type, min_overlap):
+    """The original per-occupation loop of calculate_importance_weighted_matches"""
+    common = sorted(set(user) & set(level_matrix.columns))
+    profile = pd.Series(user)
+    matches = {}
+    for occupation in level_matrix.index:
+        required_levels = level_matrix.loc[occupation, common]
+        importance_weights = importance_matrix.loc[occupation, common]
+        mask = ~(required_levels.isna() | importance_weights.isna())
+        filtered = [e for e, keep in zip(common, mask) if keep]
+        if len(filtered) < min_overlap:
+            continue
+        required = required_levels[mask].astype(float)
+        importance = importance_weights[mask].astype(float)
+        user_values = profile[filtered].astype(float)
+        if not career_recommendation.apply_threshold_requirements(
+            occupation, element_type, user_values, required, importance
+        ):
+            continue
+        fit, total = career_recommendation.calculate_weighted_fit(user_values, required, importance)
+        if total == 0:
+            continue
+        cosine = career_recommendation.importance_weighted_cosine(user_values, required, importance)
+        cov = np.cov(level_matrix[filtered].dropna().to_numpy(), rowvar=False)
+        inv_cov = np.linalg.inv(cov + career_recommendation.MAHALANOBIS_REGULARIZATION * np.eye(len(filtered)))
+        diff = user_values.to_numpy() - required.to_numpy()
+        mahalanobis = float(np.exp(-0.5 * max(diff @ inv_cov @ diff, 0.0) / len(filtered)))
+        matches[occupation] = (0.4 * fit + 0.3 * cosine + 0.3 * mahalanobis, len(filtered))
+    return matches
+
+
+def test_importance_weighted_matches_match_per_occupation_reference(monkeypatch) -> None:
+    rng = np.random.default_rng(8)
+    elements = ["Near Vision", "Oral Expression", "Stamina", "Written Expression", "Speed of Closure", "Originality"]
+    titles = [f"Occupation {i}" for i in range(20)] + ["Oral Surgeons"]
+    level = pd.DataFrame(rng.uniform(0.0, 100.0, size=(21, 6)), index=titles, columns=elements)
+    importance = pd.DataFrame(rng.uniform(0.0, 100.0, size=(21, 6)), index=titles, columns=elements)
+    level.iloc[3, 1] = np.nan  # missing level drops that element for the occupation
+    importance.iloc[5] = 0.0  # no importance at all is never a match
+    level.loc["Oral Surgeons", "Near Vision"] = 95.0  # critical rule target
+    importance.loc["Oral Surgeons", "Near Vision"] = 50.0
+
+    long = pd.concat([
+        frame.rename_axis(index="Title", columns="Element Name").stack().rename("Data Value")
+        .reset_index().assign(**{"Scale Name": scale})
+        for scale, frame in (("Level", level), ("Importance", importance))
+    ])
+    storage = SimpleNamespace(dataframes=SimpleNamespace(get={"elements-abilities-csv": long}.__getitem__))
+    monkeypatch.setattr(career_recommendation, "db", SimpleNamespace(storage=storage))
+    monkeypatch.setattr(career_recommendation, "COVARIANCE_CACHE", {})
+    monkeypatch.setattr(career_recommendation, "COMBINATION_WEIGHTS", {"fit": 0.4, "cosine": 0.3, "mahalanobis": 0.3})
+    monkeypatch.setattr(career_recommendation, "IMPORTANCE_CRITICAL_THRESHOLD", 90.0)
+    monkeypatch.setattr(career_recommendation, "MIN_REQUIREMENT_RATIO", 0.3)
+    monkeypatch.setattr(
+        career_recommendation, "CRITICAL_REQUIREMENTS",
+        [{"element": "Near Vision", "threshold_ratio": 0.8, "keywords": ["surgeon"]}],
+    )
+
+    user = {element: float(rng.uniform(20.0, 80.0)) for element in elements}
+    user["Near Vision"] = 60.0
+    items = [SkillScore(name=name, rating=rating) for name, rating in user.items()]
+
+    career_recommendation._clear_onet_caches()
+    try:
+        matches = career_recommendation.calculate_importance_weighted_matches(
+            items, "elements-abilities-csv", "abilities"
+        )
+    finally:
+        career_recommendation._clear_onet_caches()
+    expected = _reference_weighted_matches(
+        user, level.sort_index(), importance.sort_index(), "abilities", career_recommendation.MIN_OVERLAP_THRESHOLD["abilities"]
+    )
+
+    assert "Oral Surgeons" not in matches
+    assert "Occupation 5" not in matches
+    assert list(matches) == list(expected)
+    # Levels and importances are cached as float32 (about 1e-7 relative per
+    # value), while the reference scores the float64 frames
+    for title, (score, overlap) in expected.items():
+        assert np.isclose(matches[title]["score"], score, rtol=1e-6, atol=0.0)
+        assert matches[title]["overlap"] == overlap
+    assert matches["Occupation 3"]["elements"] == sorted(set(elements) - {"Oral Expression"})
+
+
+def test_interest_congruence_matches_per_occupation_scores(interests_storage) -> None:
+    ratings = {"Social": 40.0, "Artistic": 25.0, "Hobbies": 25.0, "Realistic": 10.0, "Conventional": 5.0}
+    user = [InterestScore(name=name, rating=rating) for name, rating in ratings.items()]
+
+    scores, overlaps, matched = career_recommendation.calculate_interest_congruence_all(user)
+
+    total = sum(ratings.values())
+    normalized = {name: rating / total for name, rating in ratings.items()}
+    profiles = interests_storage.pivot(index="Title", columns="Element Name", values="Data Value")
+    assert list(scores) == list(profiles.index)
+    for title, row in profiles.iterrows():
+        expected = career_recommendation.calculate_holland_congruence(normalized, row.sort_index().to_dict())
+        assert np.isclose(scores[title], expected), title
+        assert overlaps[title] == 4
+        assert matched[title] == row.sort_index().sort_values(ascending=False, kind="stable").index[:3].tolist()
+
+
+def test_covariance_factor_from_full_table_matches_subset_estimate() -> None:
+    rng = np.random.default_rng(9)
+    levels = rng.uniform(0.0, 100.0, size=(40, 6))
+    full_covariance = np.cov(levels, rowvar=False)
+    columns = [4, 1, 3]
+
+    sliced = career_recommendation._covariance_factor(levels, columns, ("a",), {}, full_covariance)
+    estimated = career_recommendation._covariance_factor(levels, columns, ("a",), {})
+
+    assert np.allclose(sliced, estimated)
+    covariance = full_covariance[np.ix_(columns, columns)]
+    ridge = career_recommendation.MAHALANOBIS_REGULARIZATION * np.eye(len(columns))
+    assert np.allclose(sliced @ sliced.T, covariance + ridge)
+
+
+@pytest.mark.parametrize("method, fill", [("minmax", 0.5), ("zscore", 0.0)])
+def test_normalize_vectors_matches_per_column_scaling(method, fill) -> None:
+    rng = np.random.default_rng(13)
+    occupations = pd.DataFrame(rng.uniform(1.0, 7.0, size=(20, 4)), columns=list("abcd"))
+    occupations["c"] = 3.0  # constant column
+    user = {"a": 8.0, "b": 2.0, "c": 5.0, "d": 0.5}
+
+    occ_out, user_out = career_recommendation.normalize_vectors(occupations, user, method, list("abcd"))
+
+    for column in "abd":
+        values = occupations[column]
+        if method == "minmax":
+            low, span = values.min(), values.max() - values.min()
+            expected_user = np.clip((user[column] - low) / span, 0, 1)
+        else:
+            low, span = values.mean(), values.std()
+            expected_user = (user[column] - low) / span
+        assert np.allclose(occ_out[column], (values - low) / span)
+        assert np.isclose(user_out[column], expected_user)
+    assert (occ_out["c"] == fill).all() and user_out["c"] == fill
+
+
+def test_compute_auc_counts_tied_scores_as_half() -> None:
+    labels = [1, 0, 1, 0, 0]
+    scores = [0.9, 0.9, 0.4, 0.2, 0.4]
+
+    pairs = [
+        1.0 if p > n else 0.5 if p == n else 0.0
+        for p, lp in zip(scores, labels) if lp == 1
+        for n, ln in zip(scores, labels) if ln == 0
+    ]
+
+    assert np.isclose(career_recommendation.compute_auc(labels, scores), np.mean(pairs))
+
+
+def test_platt_scale_reaches_regularised_log_loss_optimum() -> None:
+    rng = np.random.default_rng(17)
+    scores = rng.uniform(0.0, 1.0, size=200)
+    labels = (rng.uniform(size=200) < scores).astype(float)
+    regularization = 1e-4
+
+    A, B, iterations = career_recommendation.platt_scale(scores, labels, regularization=regularization)
+
+    error = 1.0 / (1.0 + np.exp(-(A * scores + B))) - labels
+    assert 0 < iterations < 100
+    assert A > 0
+    assert abs((error * scores).mean() + regularization * A) < 1e-5
+    assert abs(error.mean() + regularization * B) < 1e-5
+
+
+def test_platt_scale_warns_that_learning_rate_is_ignored() -> None:
+    rng = np.random.default_rng(18)
+    scores = rng.uniform(0.0, 1.0, size=50)
+    labels = (rng.uniform(size=50) < scores).astype(float)
+
+    with pytest.deprecated_call():
+        tuned = career_recommendation.platt_scale(scores, labels, learning_rate=0.5)
+
+    assert tuned == career_recommendation.platt_scale(scores, labels)
+
+
+def test_coalesce_columns_matches_first_available_per_row() -> None:
+    df = pd.DataFrame({
+        "label": [1.0, np.nan, 0.0, np.nan],
+        "success": [None, 1, None, None],
+        "outcome": ["0", "1", None, np.nan],
+    })
+    candidates = ["missing", "label", "success", "outcome"]
+
+    expected = [
+        career_recommendation._get_first_available(row, candidates)
+        for row in df.to_dict(orient="records")
+    ]
+
+    assert career_recommendation._coalesce_columns(df, candidates) == expected
+
+
+def test_unique_normalized_weights_drops_candidates_with_equal_normalization() -> None:
+    keys = ["fit", "cosine", "mahalanobis"]
+    candidates = [
+        {"fit": 0.4, "cosine": 0.3, "mahalanobis": 0.3},
+        {"fit": 4.0, "cosine": 3.0, "mahalanobis": 3.0},
+        {"fit": 0.5, "cosine": 0.5},
+        {"fit": 1.0, "cosine": 1.0, "mahalanobis": 0.0},
+    ]
+
+    unique = career_recommendation._unique_normalized_weights(candidates, keys)
+
+    assert unique == [
+        career_recommendation._normalize_weights(candidates[0], keys),
+        career_recommendation._normalize_weights(candidates[2], keys),
+    ]
+
+
+def test_recombine_category_matches_reblends_components_under_current_weights(monkeypatch) -> None:
+    monkeypatch.setattr(career_recommendation, "COMBINATION_WEIGHTS", {"fit": 0.5, "cosine": 0.2, "mahalanobis": 0.3})
+    interests = {"Occupation A": {"score": 0.7, "overlap": 6}}
+    skills = {
+        "Occupation A": {"score": 0.0, "fit_score": 0.8, "cosine_score": 0.6, "mahalanobis_score": 0.4},
+        "Occupation B": {"score": 0.0, "fit_score": 0.9, "cosine_score": 0.5, "mahalanobis_score": None},
+    }
+
+    recombined = career_recommendation._recombine_category_matches({"interests": interests, "skills": skills})
+
+    assert recombined["interests"] is interests
+    assert np.isclose(recombined["skills"]["Occupation A"]["score"], 0.5 * 0.8 + 0.2 * 0.6 + 0.3 * 0.4)
+    assert np.isclose(recombined["skills"]["Occupation B"]["score"], (0.5 * 0.9 + 0.2 * 0.5) / 0.7)
+
+
+def test_overlapping_weight_overrides_restore_the_original_weights() -> None:
+    original = dict(career_recommendation.DIMENSION_WEIGHTS)
+    candidate_a = {"interests": 1.0, "abilities": 0.0, "knowledge": 0.0, "skills": 0.0}
+    candidate_b = {"interests": 0.0, "abilities": 1.0, "knowledge": 0.0, "skills": 0.0}
+    entered = threading.Event()
+    release = threading.Event()
+    seen_by_b = []
+
+    def hold_a() -> None:
+        with career_recommendation.temporary_weight_overrides(candidate_a):
+            entered.set()
+            release.wait(5)
+
+    def run_b() -> None:
+        with career_recommendation.temporary_weight_overrides(candidate_b):
+            seen_by_b.append(dict(career_recommendation.DIMENSION_WEIGHTS))
+
+    a = threading.Thread(target=hold_a)
+    a.start()
+    entered.wait(5)
+    b = threading.Thread(target=run_b)
+    b.start()
+    b.join(0.2)
+    # B waits for A instead of saving A's candidate as its original
+    assert b.is_alive() and not seen_by_b
+    release.set()
+    a.join(5)
+    b.join(5)
+
+    assert seen_by_b == [candidate_b]
+    assert career_recommendation.DIMENSION_WEIGHTS == original
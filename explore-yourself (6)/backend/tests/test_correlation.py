@@ -0,0 +1,123 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import app.libs.correlation as correlation  # noqa: E402
+from app.libs.correlation import (  # noqa: E402
+    batch_vector_pearson,
+    masked_vector_pearson,
+    narrow_vector_pearson,
+    row_moments,
+    vector_pearson,
+)
+
+
+def _matrix() -> np.ndarray:
+    rng = np.random.default_rng(5)
+    matrix = rng.uniform(0.0, 1.0, size=(30, 8))
+    matrix[2] = 0.5  # flat occupation
+    matrix[7, 3] = np.nan  # missing rating
+    return matrix
+
+
+def test_vector_pearson_matches_corrcoef() -> None:
+    matrix = _matrix()
+    user = np.array([0.1, 0.9, 0.4, 0.3, 0.8, 0.2, 0.6, 0.7])
+
+    r = vector_pearson(user, matrix)
+
+    for i, row in enumerate(matrix):
+        if i in (2, 7):
+            assert np.isnan(r[i])
+        else:
+            assert np.isclose(r[i], np.corrcoef(user, row)[0, 1])
+
+
+def test_vector_pearson_accepts_cached_moments() -> None:
+    matrix = _matrix()
+    user = np.array([0.1, 0.9, 0.4, 0.3, 0.8, 0.2, 0.6, 0.7])
+
+    assert np.array_equal(
+        vector_pearson(user, matrix, row_moments(matrix)),
+        vector_pearson(user, matrix),
+        equal_nan=True,
+    )
+
+
+def test_vector_pearson_flat_user_has_no_correlation() -> None:
+    assert np.isnan(vector_pearson(np.full(8, 0.3), _matrix())).all()
+
+
+def test_masked_vector_pearson_skips_missing_values_per_row() -> None:
+    matrix = _matrix()
+    user = np.array([0.1, 0.9, 0.4, 0.3, 0.8, 0.2, 0.6, 0.7])
+
+    r, counts = masked_vector_pearson(user, matrix)
+
+    assert counts[7] == 7
+    keep = ~np.isnan(matrix[7])
+    assert np.isclose(r[7], np.corrcoef(user[keep], matrix[7, keep])[0, 1])
+    assert np.isnan(r[2])
+
+    complete = np.delete(np.arange(len(matrix)), 7)
+    assert np.allclose(r[complete], vector_pearson(user, matrix)[complete], equal_nan=True)
+
+
+def test_numba_kernel_matches_numpy_path(monkeypatch) -> None:
+    pytest.importorskip("numba")
+    matrix = _matrix()
+    user = np.array([0.1, 0.9, 0.4, 0.3, 0.8, 0.2, 0.6, 0.7])
+
+    expected = vector_pearson(user, matrix)
+    monkeypatch.setattr(correlation, "NUMBA_MIN_OCCUPATIONS", 0)
+    fused = vector_pearson(user, matrix)
+
+    assert np.allclose(fused, expected, equal_nan=True)
+
+
+def test_numba_masked_kernel_matches_numpy_path(monkeypatch) -> None:
+    pytest.importorskip("numba")
+    matrix = _matrix()
+    matrix[11, :7] = np.nan  # single rating left
+    user = np.array([0.1, 0.9, 0.4, 0.3, 0.8, 0.2, 0.6, 0.7])
+
+    fused, fused_counts = masked_vector_pearson(user, matrix)
+    monkeypatch.setattr(correlation, "_masked_row_pearson", None)
+    expected, counts = masked_vector_pearson(user, matrix)
+
+    assert np.array_equal(fused_counts, counts)
+    assert np.allclose(fused, expected, equal_nan=True)
+
+
+def test_batch_vector_pearson_matches_one_user_at_a_time() -> None:
+    matrix = _matrix()
+    users = np.array([
+        [0.1, 0.9, 0.4, 0.3, 0.8, 0.2, 0.6, 0.7],
+        [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5],  # flat user
+        [0.9, 0.1, 0.2, 0.8, 0.3, 0.4, 0.7, 0.6],
+    ])
+
+    r = batch_vector_pearson(users, matrix)
+
+    assert r.shape == (len(matrix), len(users))
+    for column, user in enumerate(users):
+        assert np.allclose(r[:, column], vector_pearson(user, matrix), equal_nan=True)
+
+
+def test_narrow_kernel_matches_vector_pearson(monkeypatch) -> None:
+    matrix = _matrix()[:, :6]
+    matrix[4] = 0.1  # flat row whose mean does not round-trip
+    user = np.array([0.1, 0.9, 0.4, 0.3, 0.8, 0.2])
+
+    narrow = narrow_vector_pearson(user, matrix)
+
+    assert np.isnan(narrow[[2, 4, 7]]).all()
+    assert np.allclose(narrow, vector_pearson(user, matrix), equal_nan=True)
+    assert np.isnan(narrow_vector_pearson(np.full(6, 0.3), matrix)).all()
+
+    monkeypatch.setattr(correlation, "_narrow_row_pearson", None)
+    assert np.allclose(narrow_vector_pearson(user, matrix), narrow, equal_nan=True)
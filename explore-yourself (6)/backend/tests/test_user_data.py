@@ -0,0 +1,80 @@
+import asyncio
+from pathlib import Path
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+databutton_stub = types.ModuleType("databutton")
+databutton_stub.secrets = SimpleNamespace(get=lambda _key: "{}")
+sys.modules.setdefault("databutton", databutton_stub)
+
+firebase_admin_stub = types.ModuleType("firebase_admin")
+firebase_admin_stub._apps = []
+firebase_admin_stub.initialize_app = lambda *_args, **_kwargs: None  # pragma: no cover
+
+firebase_credentials_stub = types.ModuleType("firebase_admin.credentials")
+firebase_credentials_stub.Certificate = lambda data: data  # pragma: no cover
+
+firebase_firestore_stub = types.ModuleType("firebase_admin.firestore")
+firebase_firestore_stub.client = lambda: None  # pragma: no cover
+
+sys.modules.setdefault("firebase_admin", firebase_admin_stub)
+sys.modules.setdefault("firebase_admin.credentials", firebase_credentials_stub)
+sys.modules.setdefault("firebase_admin.firestore", firebase_firestore_stub)
+
+import app.apis.user_data as user_data  # noqa: E402
+
+
+@pytest.fixture
+def assessments(monkeypatch):
+    """In-memory assessments collection; returns the ids each read asked for"""
+    documents = {"known": {"interest": {"results": [1]}}}
+    reads = []
+
+    def document(user_id):
+        def get(field_paths=None):
+            reads.append(user_id)
+            data = documents.get(user_id)
+            return SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data))
+        return SimpleNamespace(get=get)
+
+    collection = SimpleNamespace(document=document)
+    monkeypatch.setattr(user_data, "get_assessments_collection", lambda: collection)
+    monkeypatch.setattr(user_data, "_assessments_cache", type(user_data._assessments_cache)())
+    return documents, reads
+
+
+def test_missing_assessments_are_not_cached(assessments) -> None:
+    _, reads = assessments
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(user_data.get_user_assessments("unknown"))
+        assert excinfo.value.status_code == 404
+
+    assert reads == ["unknown", "unknown"]
+    assert "unknown" not in user_data._assessments_cache
+
+
+def test_assessments_cache_evicts_least_recently_used(assessments, monkeypatch) -> None:
+    documents, reads = assessments
+    documents.update({f"user-{i}": {"skills": {"results": [i]}} for i in range(3)})
+    monkeypatch.setattr(user_data, "ASSESSMENTS_CACHE_MAXSIZE", 2)
+
+    for user_id in ["user-0", "user-1", "user-0", "user-2"]:
+        asyncio.run(user_data.get_user_assessments(user_id))
+
+    assert list(user_data._assessments_cache) == ["user-0", "user-2"]
+    assert reads == ["user-0", "user-1", "user-2"]
+
+
+def test_assessment_locks_are_a_fixed_pool() -> None:
+    locks = {id(user_data._assessments_lock(f"user-{i}")) for i in range(1000)}
+
+    assert len(user_data._assessments_locks) == user_data.ASSESSMENTS_LOCK_STRIPES
+    assert locks <= {id(lock) for lock in user_data._assessments_locks}
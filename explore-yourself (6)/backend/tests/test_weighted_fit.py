@@ -0,0 +1,68 @@
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import app.libs.weighted_fit as weighted_fit_module  # noqa: E402
+from app.libs.weighted_fit import (  # noqa: E402
+    weighted_cosine_rows,
+    weighted_fit,
+    weighted_fit_rows,
+)
+
+DAMPING = 0.5
+
+
+def _arrays():
+    rng = np.random.default_rng(11)
+    required = rng.uniform(0.0, 100.0, size=(25, 7))
+    required[4, 2] = 0.0  # no requirement
+    importance = rng.uniform(0.0, 5.0, size=(25, 7))
+    importance[6] = 0.0  # nothing weighted
+    present = rng.uniform(size=(25, 7)) > 0.2
+    user = rng.uniform(0.0, 100.0, size=7)
+    return user, required, importance, present
+
+
+def test_weighted_fit_rows_matches_one_row_at_a_time() -> None:
+    user, required, importance, present = _arrays()
+
+    scores, totals = weighted_fit_rows(user, required, importance, present, DAMPING)
+
+    for i in range(len(required)):
+        row = present[i]
+        expected = weighted_fit(user[row], required[i, row], importance[i, row], DAMPING)
+        assert np.isclose(scores[i], expected[0])
+        assert np.isclose(totals[i], expected[1])
+    assert scores[6] == 0.0 and totals[6] == 0.0
+
+
+def test_numba_fit_kernels_match_fallbacks(monkeypatch) -> None:
+    pytest.importorskip("numba")
+    user, required, importance, present = _arrays()
+
+    compiled_rows = weighted_fit_rows(user, required, importance, present, DAMPING)
+    compiled_single = weighted_fit(user, required[0], importance[0], DAMPING)
+    monkeypatch.setattr(weighted_fit_module, "_fit_kernel", None)
+    monkeypatch.setattr(weighted_fit_module, "_fit_rows_kernel", None)
+    rows = weighted_fit_rows(user, required, importance, present, DAMPING)
+    single = weighted_fit(user, required[0], importance[0], DAMPING)
+
+    assert np.allclose(compiled_rows[0], rows[0])
+    assert np.allclose(compiled_rows[1], rows[1])
+    assert np.allclose(compiled_single, single)
+
+
+def test_numba_cosine_kernel_matches_fallback(monkeypatch) -> None:
+    pytest.importorskip("numba")
+    user, required, importance, present = _arrays()
+
+    compiled = weighted_cosine_rows(user, required, importance, present)
+    monkeypatch.setattr(weighted_fit_module, "_cosine_rows_kernel", None)
+    expected = weighted_cosine_rows(user, required, importance, present)
+
+    assert np.allclose(compiled, expected)
+    assert compiled[6] == 0.0